@@ -0,0 +1,64 @@
+"""
+Module: encoding.py
+
+Description:
+Ce module fournit une fonction pour encoder des colonnes catégorielles d'un DataFrame Pandas en une matrice one-hot creuse
+(scipy.sparse), directement utilisable par `OrdinaryLeastSquares.fit`. Les données de la Base Carbone (`Nom base français`,
+`Unité français`, `Nom attribut français`, ...) comptent des milliers de modalités : la matrice creuse ne stocke qu'une valeur
+non nulle par colonne encodée et par ligne, au lieu d'une matrice dense presque entièrement nulle.
+
+Utilisation:
+Ce module peut être utilisé en appelant la fonction `encode_categorical` avec un DataFrame et la liste des colonnes à encoder.
+
+Fonctions:
+- encode_categorical(data, columns, drop_first=True): Encode des colonnes catégorielles en une matrice one-hot creuse.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def encode_categorical(data, columns, drop_first=True):
+    """
+    Encode des colonnes catégorielles en une matrice one-hot creuse au format CSR.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - columns : list of str, les noms des colonnes catégorielles à encoder
+    - drop_first : bool, supprime la première modalité de chaque colonne (modalité de référence)
+      pour éviter la colinéarité avec la constante du modèle
+
+    Retourne :
+    - tuple (scipy.sparse.csr_matrix, list of str), la matrice one-hot (n_samples, n_encoded)
+      et les noms des colonnes encodées sous la forme 'colonne=modalité'
+    """
+    n_samples = len(data)
+    rows = []
+    cols = []
+    feature_names = []
+    offset = 0
+
+    for column in columns:
+        if column not in data.columns:
+            raise ValueError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
+
+        categorical = pd.Categorical(data[column])
+        codes = np.asarray(categorical.codes, dtype=np.int64)
+        categories = list(categorical.categories)
+        if drop_first:
+            codes = codes - 1
+            categories = categories[1:]
+
+        # Les valeurs manquantes (code -1) et la modalité de référence ne produisent aucune valeur non nulle
+        present = codes >= 0
+        rows.append(np.flatnonzero(present))
+        cols.append(codes[present] + offset)
+        feature_names.extend(f'{column}={category}' for category in categories)
+        offset += len(categories)
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    values = np.ones(len(rows))
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n_samples, offset))
+    return matrix, feature_names
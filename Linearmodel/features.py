@@ -0,0 +1,118 @@
+"""
+Module: features.py
+
+Description:
+Ce module fournit une classe pour construire des variables retardées (t-1, ..., t-L) sans matérialiser la matrice
+(n, p * L) correspondante. Les retards sont exposés comme une vue à pas (`sliding_window_view`) sur les colonnes chargées :
+seuls des blocs de lignes sont recopiés à la demande, ce qui permet de les passer directement à l'accumulation des matrices
+de Gram (`gram.gram_matrix`), à `OrdinaryLeastSquares.fit` et à `OrdinaryLeastSquares.predict`.
+
+Utilisation:
+Ce module peut être utilisé en créant un `LaggedDesign` à partir d'un DataFrame et des colonnes à retarder, puis en alignant
+la variable cible avec `align` avant d'ajuster le modèle.
+
+Classe:
+- LaggedDesign: Matrice des variables retardées, représentée par une vue sans copie.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .gram import _default_block_size, row_blocks
+
+
+class LaggedDesign:
+    def __init__(self, data, columns, max_lag, min_lag=1, block_size=None):
+        """
+        Initialise la matrice des variables retardées.
+
+        La ligne i de la matrice correspond à l'instant t = i + max_lag et contient, pour chaque colonne
+        et chaque retard l de min_lag à max_lag, la valeur de la colonne à l'instant t - l. Les variables
+        sont ordonnées par colonne puis par retard croissant.
+
+        Parameters:
+        - data: DataFrame, les données
+        - columns: list of str, les colonnes à retarder
+        - max_lag: int, le plus grand retard (en nombre de lignes)
+        - min_lag: int, le plus petit retard (0 pour inclure la valeur courante)
+        - block_size: int, nombre de lignes des blocs matérialisés, ou None pour une taille adaptée au cache
+        """
+        for column in columns:
+            if column not in data.columns:
+                raise ValueError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
+        if not 0 <= min_lag <= max_lag:
+            raise ValueError("Les retards doivent vérifier 0 <= min_lag <= max_lag.")
+
+        self.columns = list(columns)
+        self.max_lag = max_lag
+        self.min_lag = min_lag
+        self.n_lags = max_lag - min_lag + 1
+        self.values = np.ascontiguousarray(data[self.columns].to_numpy(dtype=float))
+
+        # view[i, j, l] = values[i + max_lag - l, j] : valeur de la colonne j retardée de l lignes
+        window = sliding_window_view(self.values, max_lag + 1, axis=0)
+        self._view = window[:, :, ::-1][:, :, min_lag:]
+        self.shape = (self._view.shape[0], len(self.columns) * self.n_lags)
+        self.block_size = block_size or _default_block_size(self.shape[1])
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        """
+        Matérialise un bloc de lignes contiguës de la matrice des variables retardées.
+
+        Parameters:
+        - key: slice, les lignes du bloc
+
+        Returns:
+        - ndarray, le bloc (n_rows, n_columns * n_lags)
+        """
+        if not isinstance(key, slice):
+            raise TypeError("LaggedDesign ne peut être indexé que par des tranches de lignes.")
+        block = self._view[key]
+        return block.reshape(block.shape[0], -1)
+
+    def __matmul__(self, coeffs):
+        """
+        Calcule le produit de la matrice des variables retardées par des coefficients, bloc par bloc.
+
+        Parameters:
+        - coeffs: ndarray, les coefficients (n_columns * n_lags,) ou (n_columns * n_lags, n_targets)
+
+        Returns:
+        - ndarray, le produit (n_rows,) ou (n_rows, n_targets)
+        """
+        coeffs = np.asarray(coeffs)
+        result = np.empty((self.shape[0],) + coeffs.shape[1:])
+        for start, stop in row_blocks(self.shape[0], self.block_size):
+            result[start:stop] = self[start:stop] @ coeffs
+        return result
+
+    @property
+    def feature_names(self):
+        """
+        Noms des variables retardées, sous la forme 'colonne(t-l)'.
+        """
+        return [f'{column}(t-{lag})' for column in self.columns for lag in range(self.min_lag, self.max_lag + 1)]
+
+    def align(self, y):
+        """
+        Aligne une variable cible sur les lignes de la matrice des variables retardées.
+
+        Parameters:
+        - y: array-like or Series, la variable cible sur toutes les lignes des données (n_samples,)
+
+        Returns:
+        - ndarray, la variable cible à partir de l'instant max_lag (vue sans copie)
+        """
+        return np.asarray(y, dtype=float)[self.max_lag:]
+
+    def to_array(self):
+        """
+        Matérialise la matrice complète des variables retardées (à réserver aux petits jeux de données).
+
+        Returns:
+        - ndarray, la matrice (n_rows, n_columns * n_lags)
+        """
+        return self[:]
@@ -0,0 +1,202 @@
+"""
+Module: forecast.py
+
+Description:
+Ce module fournit des indicateurs de précision des prévisions de consommation de RTE (`Prévision J` et `Prévision J-1`)
+par rapport à la consommation réalisée (`Consommation`) : MAE, RMSE, MAPE, biais et quantiles de l'erreur, regroupés par heure
+de la journée, par jour de la semaine et par mois. Les indicateurs sont obtenus à partir de statistiques additives (effectifs,
+sommes des erreurs, histogramme des erreurs) calculées en une seule réduction vectorisée par groupe : elles peuvent être
+mises à jour au fil de l'arrivée de nouveaux quarts d'heure et fusionnées entre plusieurs accumulateurs, sans relire l'année.
+
+Utilisation:
+Ce module peut être utilisé en appelant `evaluate_forecasts` avec un DataFrame chargé par `load_data`, ou en créant un
+`ForecastAccuracy`, en lui ajoutant des données avec `update`, puis en lisant les indicateurs avec `metrics`.
+L'erreur est définie comme prévision - réalisé (un biais positif indique une surestimation). Les lignes sans consommation
+réalisée (valeur manquante ou nulle, `load_data` remplaçant les valeurs manquantes par 0) sont ignorées.
+
+Classe:
+- ForecastAccuracy: Accumulateur fusionnable des statistiques d'erreur de prévision.
+
+Fonctions:
+- evaluate_forecasts(data, by='hour', actual='Consommation', forecasts=('Prévision J', 'Prévision J-1')): Calcule les indicateurs de précision des prévisions.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Regroupements disponibles : nombre de groupes et fonction de calcul du groupe à partir de la date
+GROUPINGS = {
+    'hour': (24, lambda datetimes: datetimes.dt.hour),
+    'weekday': (7, lambda datetimes: datetimes.dt.weekday),
+    'month': (12, lambda datetimes: datetimes.dt.month - 1),
+    'all': (1, lambda datetimes: np.zeros(len(datetimes), dtype=np.int64)),
+}
+
+# Statistiques additives conservées pour chaque prévision et chaque groupe
+SUMS = ('count', 'error', 'absolute_error', 'squared_error', 'absolute_percentage_error')
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _offsets():
+    """
+    Retourne la position du premier groupe de chaque regroupement dans l'espace commun des groupes.
+    """
+    offsets = {}
+    total = 0
+    for name, (n_groups, _) in GROUPINGS.items():
+        offsets[name] = total
+        total += n_groups
+    return offsets, total
+
+
+class ForecastAccuracy:
+    def __init__(self, actual='Consommation', forecasts=('Prévision J', 'Prévision J-1'), error_bins=None):
+        """
+        Initialise l'accumulateur des statistiques d'erreur de prévision.
+
+        Parameters:
+        - actual: str, la colonne des valeurs réalisées
+        - forecasts: tuple of str, les colonnes des prévisions à évaluer
+        - error_bins: ndarray, les bornes croissantes des classes de l'histogramme des erreurs utilisé pour
+          les quantiles (par défaut des classes de 10 entre -10000 et 10000, soit 10 MW pour la consommation)
+        """
+        self.actual = actual
+        self.forecasts = tuple(forecasts)
+        self.error_bins = np.linspace(-10000, 10000, 2001) if error_bins is None else np.asarray(error_bins, dtype=float)
+        self._offsets, self._n_groups = _offsets()
+        n_forecasts = len(self.forecasts)
+        self.sums = np.zeros((n_forecasts, self._n_groups, len(SUMS)))
+        # Histogramme avec une classe supplémentaire de chaque côté pour les erreurs hors bornes
+        self.histogram = np.zeros((n_forecasts, self._n_groups, len(self.error_bins) + 1))
+
+    def update(self, data):
+        """
+        Ajoute les erreurs de prévision de nouvelles lignes aux statistiques.
+
+        Parameters:
+        - data: DataFrame, les nouvelles lignes avec les colonnes Datetime, actual et forecasts
+
+        Returns:
+        - ForecastAccuracy, l'accumulateur mis à jour
+        """
+        for column in ('Datetime', self.actual) + self.forecasts:
+            if column not in data.columns:
+                raise ValueError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
+
+        datetimes = pd.to_datetime(data['Datetime'])
+        # Un code de groupe par regroupement, dans un espace commun : (n_rows, n_groupings)
+        codes = np.column_stack([np.asarray(function(datetimes)) + self._offsets[name]
+                                 for name, (_, function) in GROUPINGS.items()])
+        actual = data[self.actual].to_numpy(dtype=float)
+        n_bins = self.histogram.shape[2]
+
+        for k, forecast in enumerate(self.forecasts):
+            predicted = data[forecast].to_numpy(dtype=float)
+            valid = ~np.isnan(actual) & ~np.isnan(predicted) & (actual != 0)
+            error = predicted[valid] - actual[valid]
+            absolute_error = np.abs(error)
+            values = np.column_stack((np.ones(len(error)), error, absolute_error, error ** 2,
+                                      absolute_error / np.abs(actual[valid])))
+            group_codes = codes[valid]
+
+            # Une seule réduction par statistique pour tous les regroupements : bincount sur les codes de groupe
+            flat_codes = group_codes.ravel()
+            repeated = np.repeat(values, group_codes.shape[1], axis=0)
+            for j in range(len(SUMS)):
+                self.sums[k, :, j] += np.bincount(flat_codes, weights=repeated[:, j], minlength=self._n_groups)
+
+            bins = np.repeat(np.searchsorted(self.error_bins, error, side='right'), group_codes.shape[1])
+            counts = np.bincount(flat_codes * n_bins + bins, minlength=self._n_groups * n_bins)
+            self.histogram[k] += counts.reshape(self._n_groups, n_bins)
+        return self
+
+    def merge(self, other):
+        """
+        Fusionne les statistiques d'un autre accumulateur (par exemple calculées sur une autre période).
+
+        Parameters:
+        - other: ForecastAccuracy, l'accumulateur à fusionner, avec les mêmes colonnes et classes d'erreur
+
+        Returns:
+        - ForecastAccuracy, l'accumulateur mis à jour
+        """
+        if (other.actual, other.forecasts) != (self.actual, self.forecasts) or \
+                not np.array_equal(other.error_bins, self.error_bins):
+            raise ValueError("Les accumulateurs à fusionner doivent avoir les mêmes colonnes et classes d'erreur.")
+        self.sums += other.sums
+        self.histogram += other.histogram
+        return self
+
+    def metrics(self, by='hour'):
+        """
+        Calcule les indicateurs de précision de chaque prévision pour un regroupement.
+
+        Parameters:
+        - by: str, le regroupement parmi 'hour', 'weekday', 'month' et 'all'
+
+        Returns:
+        - DataFrame, indexé par (prévision, groupe), avec les colonnes Count, MAE, RMSE, MAPE (en %), Bias
+          et les quantiles de l'erreur (Q5, Q25, Q50, Q75, Q95), NaN pour les groupes vides
+        """
+        if by not in GROUPINGS:
+            raise ValueError(f"Regroupement inconnu : '{by}'. Valeurs possibles : {tuple(GROUPINGS)}.")
+        n_groups = GROUPINGS[by][0]
+        groups = slice(self._offsets[by], self._offsets[by] + n_groups)
+        sums = self.sums[:, groups]
+        count = sums[..., 0]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns = {
+                'Count': count,
+                'MAE': sums[..., 2] / count,
+                'RMSE': np.sqrt(sums[..., 3] / count),
+                'MAPE': 100 * sums[..., 4] / count,
+                'Bias': sums[..., 1] / count,
+            }
+        quantiles = self._quantiles(self.histogram[:, groups])
+        for q, quantile in zip(QUANTILES, quantiles):
+            columns[f'Q{round(q * 100)}'] = quantile
+
+        index = pd.MultiIndex.from_product([self.forecasts, range(n_groups)], names=['Forecast', by])
+        return pd.DataFrame({name: values.ravel() for name, values in columns.items()}, index=index)
+
+    def _quantiles(self, histogram):
+        """
+        Estime les quantiles de l'erreur par interpolation linéaire dans les classes de l'histogramme.
+        Les erreurs hors bornes sont ramenées à la borne la plus proche.
+        """
+        edges = np.concatenate(([self.error_bins[0]], self.error_bins, [self.error_bins[-1]]))
+        cumulative = np.cumsum(histogram, axis=-1)
+        total = cumulative[..., -1:]
+        results = []
+        for q in QUANTILES:
+            with np.errstate(invalid='ignore'):
+                target = q * total
+            position = np.minimum(np.sum(cumulative < target, axis=-1), histogram.shape[-1] - 1)
+            before = np.take_along_axis(cumulative, position[..., None], axis=-1)[..., 0] - \
+                np.take_along_axis(histogram, position[..., None], axis=-1)[..., 0]
+            in_bin = np.take_along_axis(histogram, position[..., None], axis=-1)[..., 0]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                fraction = np.where(in_bin > 0, (target[..., 0] - before) / in_bin, 0.0)
+            lower = edges[position]
+            upper = edges[position + 1]
+            quantile = lower + fraction * (upper - lower)
+            results.append(np.where(total[..., 0] > 0, quantile, np.nan))
+        return results
+
+
+def evaluate_forecasts(data, by='hour', actual='Consommation', forecasts=('Prévision J', 'Prévision J-1')):
+    """
+    Calcule les indicateurs de précision des prévisions (MAE, RMSE, MAPE, biais, quantiles de l'erreur).
+
+    Paramètres :
+    - data : DataFrame, les données avec les colonnes Datetime, actual et forecasts
+    - by : str, le regroupement parmi 'hour', 'weekday', 'month' et 'all'
+    - actual : str, la colonne des valeurs réalisées
+    - forecasts : tuple of str, les colonnes des prévisions à évaluer
+
+    Retourne :
+    - DataFrame, les indicateurs indexés par (prévision, groupe)
+    """
+    return ForecastAccuracy(actual=actual, forecasts=forecasts).update(data).metrics(by)
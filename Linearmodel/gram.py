@@ -0,0 +1,224 @@
+"""
+Module: gram.py
+
+Description:
+Ce module fournit le moteur de calcul des matrices de Gram (X^T W X et X^T W y) utilisé par `OrdinaryLeastSquares.fit`
+et par les fonctions de covariance et de corrélation de `statistics.py`. Les lignes de X sont découpées en blocs
+de taille adaptée au cache, et les matrices de Gram partielles sont accumulées en parallèle dans un pool de threads
+(NumPy libère le GIL pendant les produits matriciels). La constante du modèle est prise en compte à partir des sommes
+des colonnes, sans recopier X dans une matrice élargie.
+
+Utilisation:
+Ce module peut être utilisé en appelant la fonction `gram_matrix` avec une matrice dense ou creuse, et éventuellement
+un vecteur (ou une matrice) de réponses et des poids.
+
+Fonctions:
+- gram_matrix(X, y=None, sample_weight=None, intercept=False, block_size=None, n_jobs=1): Calcule X^T W X et X^T W y par blocs de lignes.
+- row_blocks(n_rows, block_size): Découpe les indices de lignes en blocs contigus.
+- design_block(X, start, stop, intercept=False): Retourne un bloc de lignes dense de la matrice du modèle.
+- column_means(X, sample_weight=None, block_size=None): Calcule les moyennes (pondérées) des colonnes par blocs de lignes.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+# Taille visée d'un bloc de lignes, de l'ordre du cache L2
+BLOCK_BYTES = 2 ** 21
+
+
+def _scale_rows(X, factor):
+    """
+    Multiplie chaque ligne de X (dense ou creuse) par le facteur correspondant.
+    """
+    if sparse.issparse(X):
+        return sparse.diags(factor) @ X
+    return factor[:, None] * X
+
+
+def _to_dense(X):
+    """
+    Convertit une matrice creuse en ndarray, laisse les ndarray inchangés.
+    """
+    return X.toarray() if sparse.issparse(X) else np.asarray(X)
+
+
+def row_blocks(n_rows, block_size):
+    """
+    Découpe les indices de lignes en blocs contigus.
+
+    Paramètres :
+    - n_rows : int, le nombre de lignes
+    - block_size : int, le nombre de lignes par bloc
+
+    Retourne :
+    - list of tuple (int, int), les bornes (début, fin) de chaque bloc
+    """
+    return [(start, min(start + block_size, n_rows)) for start in range(0, n_rows, block_size)]
+
+
+def design_block(X, start, stop, intercept=False):
+    """
+    Retourne un bloc de lignes dense de la matrice du modèle, avec la colonne constante si demandé.
+
+    Paramètres :
+    - X : ndarray or scipy.sparse matrix, matrice des variables explicatives (n_samples, n_features)
+    - start : int, première ligne du bloc
+    - stop : int, fin (exclue) du bloc
+    - intercept : bool, ajoute une colonne de 1 en première position
+
+    Retourne :
+    - ndarray, le bloc (stop - start, n_features + intercept)
+    """
+    block = _to_dense(X[start:stop])
+    if intercept:
+        block = np.hstack((np.ones((block.shape[0], 1)), block))
+    return block
+
+
+def _default_block_size(n_columns):
+    """
+    Calcule un nombre de lignes par bloc pour que chaque bloc tienne dans BLOCK_BYTES.
+    """
+    return max(256, BLOCK_BYTES // (8 * max(n_columns, 1)))
+
+
+def column_means(X, sample_weight=None, block_size=None):
+    """
+    Calcule les moyennes (pondérées) des colonnes de X par blocs de lignes.
+
+    Paramètres :
+    - X : ndarray, scipy.sparse matrix or LaggedDesign, matrice des variables explicatives (n_samples, n_features)
+    - sample_weight : ndarray, poids des observations (n_samples,), ou None pour des poids égaux
+    - block_size : int, nombre de lignes par bloc, ou None pour une taille adaptée au cache
+
+    Retourne :
+    - ndarray, les moyennes des colonnes (n_features,)
+    """
+    if isinstance(X, np.ndarray):
+        return np.average(X, axis=0, weights=sample_weight)
+    sums = np.zeros(X.shape[1])
+    for start, stop in row_blocks(X.shape[0], block_size or _default_block_size(X.shape[1])):
+        block = _to_dense(X[start:stop])
+        if sample_weight is not None:
+            block = _scale_rows(block, sample_weight[start:stop])
+        sums += block.sum(axis=0)
+    return sums / (X.shape[0] if sample_weight is None else np.sum(sample_weight))
+
+
+def _accumulate(X, y, sample_weight, blocks, shift=None):
+    """
+    Accumule les contributions d'une liste de blocs : X^T W X, X^T W y, sommes pondérées des colonnes et de y.
+    Pour une matrice creuse, X^T W X reste creuse.
+    """
+    n_features = X.shape[1]
+    if sparse.issparse(X):
+        gram = sparse.csr_matrix((n_features, n_features))
+    else:
+        gram = np.zeros((n_features, n_features))
+    column_sums = np.zeros(n_features)
+    weight_sum = 0.0
+    Xty = None if y is None else np.zeros((n_features,) + y.shape[1:])
+    y_sum = None if y is None else np.zeros(y.shape[1:])
+
+    for start, stop in blocks:
+        block = X[start:stop]
+        if shift is not None:
+            block = _to_dense(block) - shift
+        if sample_weight is None:
+            weights = None
+            weighted_block = block
+            weight_sum += stop - start
+        else:
+            weights = sample_weight[start:stop]
+            weighted_block = _scale_rows(block, weights)
+            weight_sum += weights.sum()
+        gram = gram + block.T @ weighted_block
+        column_sums += np.asarray(weighted_block.sum(axis=0)).ravel()
+        if y is not None:
+            weighted_y = y[start:stop]
+            if weights is not None:
+                weighted_y = weights.reshape((-1,) + (1,) * (y.ndim - 1)) * weighted_y
+            Xty += _to_dense(block.T @ weighted_y)
+            y_sum += weighted_y.sum(axis=0)
+
+    return gram, column_sums, weight_sum, Xty, y_sum
+
+
+def gram_matrix(X, y=None, sample_weight=None, intercept=False, block_size=None, n_jobs=1, shift=None):
+    """
+    Calcule X^T W X et X^T W y en accumulant des matrices de Gram partielles par blocs de lignes.
+
+    Avec n_jobs > 1, les blocs sont répartis entre les threads d'un pool ; chaque thread accumule ses
+    propres sommes partielles, qui sont additionnées à la fin. Pour éviter la sursouscription des
+    cœurs, il peut être utile de limiter les threads BLAS (par exemple OPENBLAS_NUM_THREADS=1).
+    Une matrice creuse n'est pas découpée en blocs denses : chaque thread calcule un seul produit
+    creux X^T W X sur sa part des lignes, et le résultat n'est densifié qu'une fois à la fin.
+
+    Lorsque les colonnes ont de grandes moyennes devant leurs écarts, les sommes non centrées perdent
+    la précision des termes centrés par compensation : `shift` (par exemple les moyennes des colonnes,
+    voir `column_means`) est alors retranché de chaque ligne de X avant l'accumulation. Pour une matrice
+    creuse, le décalage est appliqué après coup aux sommes, pour ne pas densifier X.
+
+    Paramètres :
+    - X : ndarray or scipy.sparse matrix, matrice des variables explicatives (n_samples, n_features)
+    - y : ndarray, vecteur (n_samples,) ou matrice (n_samples, n_targets) des réponses, ou None
+    - sample_weight : ndarray, poids des observations (n_samples,), ou None pour des poids égaux
+    - intercept : bool, ajoute la colonne constante (en première position) au calcul
+    - block_size : int, nombre de lignes par bloc, ou None pour une taille adaptée au cache
+      (ignoré pour une matrice creuse)
+    - n_jobs : int, nombre de threads, ou None pour utiliser tous les cœurs
+    - shift : ndarray, vecteur (n_features,) retranché de chaque ligne de X, ou None
+
+    Retourne :
+    - tuple (ndarray, ndarray or None), la matrice X^T W X (n_params, n_params) et X^T W y
+      (n_params,) ou (n_params, n_targets), None si y n'est pas fourni
+    """
+    n_samples = X.shape[0]
+    is_sparse = sparse.issparse(X)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if is_sparse:
+        # Une part contiguë des lignes par thread
+        blocks = row_blocks(n_samples, max(1, -(-n_samples // n_jobs)))
+    else:
+        blocks = row_blocks(n_samples, block_size or _default_block_size(X.shape[1]))
+    n_jobs = max(1, min(n_jobs, len(blocks)))
+    block_shift = None if is_sparse else shift
+
+    if n_jobs == 1:
+        partials = [_accumulate(X, y, sample_weight, blocks, block_shift)]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_accumulate, X, y, sample_weight, blocks[k::n_jobs], block_shift)
+                       for k in range(n_jobs)]
+            partials = [future.result() for future in futures]
+
+    gram, column_sums, weight_sum, Xty, y_sum = partials[0]
+    for partial in partials[1:]:
+        gram = gram + partial[0]
+        column_sums += partial[1]
+        weight_sum += partial[2]
+        if y is not None:
+            Xty += partial[3]
+            y_sum += partial[4]
+    gram = _to_dense(gram)
+
+    if is_sparse and shift is not None:
+        # Σw (x - m)(x - m)^T = X^T W X - m c^T - c m^T + Σw m m^T, avec c = Σw x
+        gram = gram - np.outer(shift, column_sums) - np.outer(column_sums, shift) \
+            + weight_sum * np.outer(shift, shift)
+        column_sums = column_sums - weight_sum * shift
+        if y is not None:
+            Xty = Xty - np.multiply.outer(shift, y_sum)
+
+    if intercept:
+        # [[Σw, Σw x^T], [Σw x, X^T W X]] et [Σw y ; X^T W y]
+        gram = np.block([[np.array([[weight_sum]]), column_sums[None, :]],
+                         [column_sums[:, None], gram]])
+        if y is not None:
+            Xty = np.concatenate((y_sum[None], Xty))
+
+    return gram, Xty
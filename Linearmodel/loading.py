@@ -2,33 +2,52 @@
 Module: loading.py
 
 Description:
-Ce module fournit une fonction pour charger et préparer des données à partir d'un fichier CSV en utilisant Pandas. 
+Ce module fournit une fonction pour charger et préparer des données à partir d'un fichier CSV en utilisant Pandas.
 Il convertit les colonnes de date et d'heure en un format datetime, remplace les valeurs manquantes par 0, et supprime les colonnes originales de date et d'heure.
+Les filtres sur une plage de dates et sur des colonnes peuvent être appliqués pendant la lecture : à la première lecture filtrée,
+le fichier est découpé en blocs de lignes dont les positions (en octets), les bornes de dates et les minimums et maximums des colonnes
+numériques sont enregistrés dans un fichier annexe (`<fichier>.zones.json`). Les lectures filtrées suivantes n'analysent que les
+blocs dont les zones peuvent contenir des lignes correspondantes, lus directement à leur position dans le fichier.
+La classe `DataIndex` indexe un DataFrame déjà chargé par sa colonne `Datetime` triée, avec des zones min/max par bloc
+pour les colonnes numériques, afin de répondre aux requêtes par recherche dichotomique et en n'examinant que les blocs utiles.
 
 Utilisation:
 Ce module peut être utilisé pour charger et préparer des données CSV en appelant la fonction `load_data` avec le chemin vers le fichier CSV.
 
 Fonctions:
-- load_data(file_path): Charge les données à partir d'un fichier CSV, convertit les colonnes de date et d'heure en datetime, remplace les valeurs manquantes par 0, et supprime les colonnes originales de date et d'heure.
+- load_data(file_path, start=None, end=None, filters=None, chunksize=4096): Charge les données (en ne décodant que les blocs utiles si des filtres sont donnés) à partir d'un fichier CSV, convertit les colonnes de date et d'heure en datetime, remplace les valeurs manquantes par 0, et supprime les colonnes originales de date et d'heure.
+- load_indexed_data(file_path, block_size=4096): Charge les données et construit un `DataIndex`.
+
+Classe:
+- DataIndex: Index trié sur `Datetime` avec zones min/max par bloc.
 """
 
+import io
+import json
+import operator
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 
-def load_data(file_path):
-    """
-    Charge les données à partir d'un fichier CSV en utilisant Pandas, convertit les colonnes de date et d'heure,
-    et remplace les valeurs manquantes par 0.
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
 
-    Paramètres :
-    - file_path : str, chemin vers le fichier CSV
+# Options de lecture communes à la lecture complète et à la lecture par blocs
+READ_OPTIONS = {'sep': ';', 'na_values': ['', ' ']}
 
-    Retourne :
-    - DataFrame contenant les données chargées avec les colonnes de date et d'heure converties
-      et les valeurs manquantes remplacées par 0
-    """
-    # Charger les données depuis le fichier CSV
-    df = pd.read_csv(file_path, sep=';', na_values=['', ' '])
 
+def _prepare(df):
+    """
+    Convertit Date et Heures en Datetime, remplace les valeurs manquantes par 0 et supprime les anciennes colonnes.
+    """
     # Convertir Date et Heures en datetime
     df['Datetime'] = pd.to_datetime(
         df['Date'] + ' ' + df['Heures'], format='%Y-%m-%d %H:%M'
@@ -42,3 +61,323 @@ def load_data(file_path):
 
     return df
 
+
+def _check_filters(filters):
+    """
+    Vérifie que chaque filtre est un triplet (colonne, opérateur, valeur) avec un opérateur connu.
+    """
+    for column, op, value in filters:
+        if op not in OPERATORS:
+            raise ValueError(f"Opérateur inconnu : '{op}'. Valeurs possibles : {tuple(OPERATORS)}.")
+
+
+def _timestamp(value):
+    """
+    Convertit une date en nombre de nanosecondes, ou retourne None.
+    """
+    return None if value is None else pd.Timestamp(value).value
+
+
+def _datetime_values(datetimes):
+    """
+    Retourne les dates d'une colonne Datetime en nanosecondes (int64).
+    """
+    return np.asarray(datetimes.astype('datetime64[ns]')).view('i8')
+
+
+def _zone_may_match(minimum, maximum, op, value):
+    """
+    Indique si un bloc dont les valeurs sont comprises entre minimum et maximum peut contenir une ligne vérifiant le filtre.
+    """
+    if op == '==':
+        return (minimum <= value) & (value <= maximum)
+    if op == '!=':
+        return ~((minimum == value) & (maximum == value))
+    if op in ('<', '<='):
+        return OPERATORS[op](minimum, value)
+    return OPERATORS[op](maximum, value)
+
+
+def _row_mask(df, datetimes, start, end, filters):
+    """
+    Calcule le masque des lignes d'un bloc qui vérifient la plage de dates et les filtres.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= datetimes >= start
+    if end is not None:
+        mask &= datetimes < end
+    for column, op, value in filters:
+        mask &= np.asarray(OPERATORS[op](df[column], value))
+    return mask
+
+
+def _zone_file(file_path):
+    """
+    Retourne le chemin du fichier annexe des zones d'un fichier CSV.
+    """
+    return f'{file_path}.zones.json'
+
+
+def _read_block(file, header, start, stop):
+    """
+    Lit et prépare les lignes d'un bloc [start, stop) (positions en octets) du fichier CSV.
+    """
+    file.seek(start)
+    return _prepare(pd.read_csv(io.BytesIO(header + file.read(stop - start)), **READ_OPTIONS))
+
+
+def _build_zones(file_path, chunksize):
+    """
+    Découpe le fichier CSV en blocs de chunksize lignes et calcule leurs positions, bornes de dates et zones min/max.
+    """
+    status = os.stat(file_path)
+    with open(file_path, 'rb') as file:
+        content = file.read()
+    # Fins de lignes : la première termine l'en-tête, puis une borne de bloc toutes les chunksize lignes
+    line_ends = np.flatnonzero(np.frombuffer(content, dtype=np.uint8) == ord('\n')) + 1
+    header_end = int(line_ends[0]) if len(line_ends) else len(content)
+    bounds = [header_end] + [int(end) for end in line_ends[1:][chunksize - 1::chunksize]]
+    if bounds[-1] < len(content):
+        bounds.append(len(content))
+
+    header = content[:header_end]
+    blocks, datetime_min, datetime_max, zone_min, zone_max, dtypes = [], [], [], [], [], {}
+    with open(file_path, 'rb') as file:
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            chunk = _read_block(file, header, start, stop)
+            if chunk.empty:
+                continue
+            numeric = chunk.select_dtypes(include=[np.number])
+            datetimes = _datetime_values(chunk['Datetime'])
+            blocks.append([start, stop])
+            datetime_min.append(int(datetimes.min()))
+            datetime_max.append(int(datetimes.max()))
+            zone_min.append(numeric.min().reindex(chunk.columns).tolist())
+            zone_max.append(numeric.max().reindex(chunk.columns).tolist())
+            for column, dtype in chunk.dtypes.items():
+                dtypes[column] = np.result_type(dtypes.get(column, dtype), dtype)
+
+    columns = list(dtypes)
+    numeric_columns = [j for j, column in enumerate(columns) if np.issubdtype(dtypes[column], np.number)]
+    return {
+        'size': status.st_size,
+        'mtime_ns': status.st_mtime_ns,
+        'chunksize': chunksize,
+        'header_end': header_end,
+        'columns': columns,
+        'dtypes': {column: str(dtype) for column, dtype in dtypes.items()},
+        'zone_columns': [columns[j] for j in numeric_columns],
+        'blocks': blocks,
+        'datetime_min': datetime_min,
+        'datetime_max': datetime_max,
+        'zone_min': [[row[j] for j in numeric_columns] for row in zone_min],
+        'zone_max': [[row[j] for j in numeric_columns] for row in zone_max],
+    }
+
+
+def _load_zones(file_path, chunksize):
+    """
+    Charge le fichier annexe des zones, ou le (re)construit s'il est absent ou ne correspond plus au fichier CSV.
+    """
+    zone_path = _zone_file(file_path)
+    status = os.stat(file_path)
+    try:
+        with open(zone_path) as file:
+            zones = json.load(file)
+        if (zones['size'], zones['mtime_ns'], zones['chunksize']) == (status.st_size, status.st_mtime_ns, chunksize):
+            return zones
+    except (OSError, ValueError, KeyError):
+        pass
+
+    zones = _build_zones(file_path, chunksize)
+    try:
+        # Écriture atomique ; si le répertoire n'est pas accessible en écriture, les zones ne sont pas conservées
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(zone_path)), suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump(zones, file)
+        os.replace(temporary_path, zone_path)
+    except OSError:
+        pass
+    return zones
+
+
+def load_data(file_path, start=None, end=None, filters=None, chunksize=4096):
+    """
+    Charge les données à partir d'un fichier CSV en utilisant Pandas, convertit les colonnes de date et d'heure,
+    et remplace les valeurs manquantes par 0.
+
+    Si une plage de dates ou des filtres sont donnés, le fichier est découpé en blocs de `chunksize` lignes
+    dont les positions, bornes de dates et zones min/max sont enregistrées dans le fichier annexe
+    `<file_path>.zones.json` (construit à la première lecture filtrée, puis reconstruit si le fichier CSV
+    ou `chunksize` change). Seuls les blocs dont les zones peuvent contenir des lignes correspondantes
+    sont lus et décodés. Les filtres sur des colonnes non numériques n'écartent aucun bloc.
+
+    Paramètres :
+    - file_path : str, chemin vers le fichier CSV
+    - start : str or Timestamp, date de début (incluse), ou None
+    - end : str or Timestamp, date de fin (exclue), ou None
+    - filters : list of tuple, filtres (colonne, opérateur, valeur) avec un opérateur parmi
+      '==', '!=', '<', '<=', '>', '>=', appliqués après le remplacement des valeurs manquantes
+    - chunksize : int, nombre de lignes par bloc lorsque des filtres sont appliqués
+
+    Retourne :
+    - DataFrame contenant les données chargées avec les colonnes de date et d'heure converties
+      et les valeurs manquantes remplacées par 0
+    """
+    filters = list(filters or [])
+    _check_filters(filters)
+
+    if start is None and end is None and not filters:
+        # Charger les données depuis le fichier CSV
+        df = pd.read_csv(file_path, **READ_OPTIONS)
+        return _prepare(df)
+
+    start = _timestamp(start)
+    end = _timestamp(end)
+    zones = _load_zones(file_path, chunksize)
+
+    # Élagage des blocs par les bornes de dates et les zones min/max, avant toute lecture
+    candidates = np.ones(len(zones['blocks']), dtype=bool)
+    if start is not None:
+        candidates &= np.asarray(zones['datetime_max'], dtype=np.int64) >= start
+    if end is not None:
+        candidates &= np.asarray(zones['datetime_min'], dtype=np.int64) < end
+    zone_min = np.asarray(zones['zone_min'], dtype=float).reshape(len(candidates), -1)
+    zone_max = np.asarray(zones['zone_max'], dtype=float).reshape(len(candidates), -1)
+    for column, op, value in filters:
+        if column in zones['zone_columns']:
+            j = zones['zone_columns'].index(column)
+            candidates &= _zone_may_match(zone_min[:, j], zone_max[:, j], op, value)
+
+    # Les blocs candidats consécutifs sont lus et décodés en une seule fois
+    blocks = np.flatnonzero(candidates)
+    runs = np.split(blocks, np.flatnonzero(np.diff(blocks) > 1) + 1) if len(blocks) else []
+
+    selected = []
+    with open(file_path, 'rb') as file:
+        header = file.read(zones['header_end'])
+        for run in runs:
+            # Types de la lecture complète : un bloc sans valeur manquante ne doit pas rester en entiers
+            chunk = _read_block(file, header, zones['blocks'][run[0]][0], zones['blocks'][run[-1]][1])
+            chunk = chunk.astype(zones['dtypes'])
+            mask = _row_mask(chunk, _datetime_values(chunk['Datetime']), start, end, filters)
+            if mask.any():
+                selected.append(chunk[mask])
+
+    if not selected:
+        return pd.DataFrame(columns=zones['columns']).astype(zones['dtypes'])
+    return pd.concat(selected, ignore_index=True)
+
+
+def load_indexed_data(file_path, block_size=4096):
+    """
+    Charge les données et construit un index trié sur la colonne Datetime.
+
+    Paramètres :
+    - file_path : str, chemin vers le fichier CSV
+    - block_size : int, nombre de lignes par bloc pour les zones min/max
+
+    Retourne :
+    - DataIndex, l'index des données chargées
+    """
+    return DataIndex(load_data(file_path), block_size=block_size)
+
+
+class DataIndex:
+    def __init__(self, data, block_size=4096):
+        """
+        Construit l'index trié sur la colonne Datetime et les zones min/max par bloc des colonnes numériques.
+
+        Parameters:
+        - data: DataFrame, les données avec une colonne Datetime (triées si nécessaire)
+        - block_size: int, nombre de lignes par bloc
+        """
+        if 'Datetime' not in data.columns:
+            raise ValueError("La colonne 'Datetime' n'existe pas dans le DataFrame.")
+        if not data['Datetime'].is_monotonic_increasing:
+            data = data.sort_values('Datetime', kind='mergesort')
+        self.data = data.reset_index(drop=True)
+        self.block_size = block_size
+        self.datetimes = _datetime_values(self.data['Datetime'])
+
+        # Zones min/max : une ligne par bloc, une colonne par variable numérique
+        numeric = self.data.select_dtypes(include=[np.number])
+        self.zone_columns = numeric.columns.tolist()
+        values = numeric.to_numpy(dtype=float)
+        starts = np.arange(0, len(values), block_size)
+        if len(values):
+            self.zone_min = np.minimum.reduceat(values, starts, axis=0)
+            self.zone_max = np.maximum.reduceat(values, starts, axis=0)
+        else:
+            self.zone_min = self.zone_max = np.empty((0, len(self.zone_columns)))
+
+    def range(self, start=None, end=None):
+        """
+        Retourne les lignes dont la date est comprise dans [start, end), par recherche dichotomique.
+
+        Parameters:
+        - start: str or Timestamp, date de début (incluse), ou None
+        - end: str or Timestamp, date de fin (exclue), ou None
+
+        Returns:
+        - DataFrame, les lignes de la plage (vue sur les données indexées)
+        """
+        first, last = self._positions(start, end)
+        return self.data.iloc[first:last]
+
+    def query(self, start=None, end=None, filters=None, hours=None):
+        """
+        Retourne les lignes de la plage de dates qui vérifient les filtres.
+
+        Les blocs dont les zones min/max excluent un filtre sont écartés sans examiner leurs lignes.
+
+        Parameters:
+        - start: str or Timestamp, date de début (incluse), ou None
+        - end: str or Timestamp, date de fin (exclue), ou None
+        - filters: list of tuple, filtres (colonne, opérateur, valeur) sur des colonnes numériques
+        - hours: tuple (int, int), heures de début et de fin (incluses) à conserver, par exemple (18, 23) pour les soirées
+
+        Returns:
+        - DataFrame, les lignes sélectionnées
+        """
+        filters = list(filters or [])
+        _check_filters(filters)
+        for column, op, value in filters:
+            if column not in self.zone_columns:
+                raise ValueError(f"La colonne '{column}' n'est pas une colonne numérique indexée.")
+
+        first, last = self._positions(start, end)
+        if first >= last:
+            return self.data.iloc[0:0]
+
+        # Élagage des blocs par les zones min/max
+        blocks = np.arange(first // self.block_size, (last - 1) // self.block_size + 1)
+        candidates = np.ones(len(blocks), dtype=bool)
+        for column, op, value in filters:
+            j = self.zone_columns.index(column)
+            candidates &= _zone_may_match(self.zone_min[blocks, j], self.zone_max[blocks, j], op, value)
+
+        selected = []
+        for block in blocks[candidates]:
+            lower = max(block * self.block_size, first)
+            upper = min((block + 1) * self.block_size, last)
+            rows = self.data.iloc[lower:upper]
+            mask = _row_mask(rows, None, None, None, filters)
+            if hours is not None:
+                hour = rows['Datetime'].dt.hour.to_numpy()
+                mask &= (hour >= hours[0]) & (hour <= hours[1])
+            if mask.any():
+                selected.append(rows[mask])
+
+        if not selected:
+            return self.data.iloc[0:0]
+        return pd.concat(selected)
+
+    def _positions(self, start, end):
+        """
+        Calcule les positions [first, last) des lignes de la plage de dates.
+        """
+        first = 0 if start is None else int(np.searchsorted(self.datetimes, _timestamp(start), side='left'))
+        last = len(self.datetimes) if end is None else int(np.searchsorted(self.datetimes, _timestamp(end), side='left'))
+        return first, last
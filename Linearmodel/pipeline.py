@@ -0,0 +1,319 @@
+"""
+Module: pipeline.py
+
+Description:
+Ce module fournit un pipeline d'analyse constitué d'étapes nommées, dont les résultats sont mémorisés sur disque.
+Chaque étape déclare les étapes dont elle dépend, ses paramètres, les fichiers qu'elle lit et ceux qu'elle produit.
+La clé de cache d'une étape est une empreinte SHA-256 de son nom, du code source des fonctions et classes locales dont dépend
+sa fonction, de ses paramètres, du contenu des fichiers lus et des clés des étapes dont elle dépend : une modification ne provoque donc
+le recalcul que des étapes situées en aval. Les fichiers produits (par exemple les images PNG) sont conservés dans le cache et
+restaurés s'ils ont disparu. La taille du cache est limitée, les entrées les moins récemment utilisées étant supprimées
+en premier.
+
+Utilisation:
+Ce module peut être utilisé en créant un `Pipeline`, en lui ajoutant des étapes avec `add_stage`, puis en appelant `run`.
+Les dépendances d'une étape sont sa fonction puis, de proche en proche, les fonctions, classes et constantes désignées par
+les noms globaux utilisés dans leur code, hors bibliothèque standard et paquets installés : modifier par exemple
+`OrdinaryLeastSquares` ou `gram_matrix` invalide les étapes dont la fonction les utilise, mais modifier une fonction de
+`visualization.py` n'invalide que les étapes de tracé qui l'appellent. Le code des paquets installés n'est pas suivi ; le paramètre
+`version` d'une étape permet d'invalider son cache manuellement (par exemple après une mise à jour de Pandas).
+
+Classe:
+- Pipeline: Pipeline d'étapes nommées avec cache sur disque adressé par le contenu.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sysconfig
+import tempfile
+from collections import namedtuple
+
+Stage = namedtuple('Stage', ['name', 'func', 'inputs', 'params', 'files', 'outputs', 'version'])
+
+# Répertoires de la bibliothèque standard et des paquets installés, dont le code n'entre pas dans les clés de cache
+LIBRARY_PATHS = tuple(os.path.realpath(path) for name, path in sysconfig.get_paths().items()
+                      if name in ('stdlib', 'platstdlib', 'purelib', 'platlib'))
+
+
+def _hash_file(file_path):
+    """
+    Calcule l'empreinte SHA-256 du contenu d'un fichier.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _function_source(func):
+    """
+    Retourne le code source d'une fonction, ou son nom qualifié si le source n'est pas disponible.
+    """
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f'{getattr(func, "__module__", "")}.{getattr(func, "__qualname__", repr(func))}'
+
+
+def _is_local(obj):
+    """
+    Indique si un objet est défini dans un fichier source local (hors bibliothèque standard et paquets installés).
+    """
+    file_path = getattr(inspect.getmodule(obj), '__file__', None)
+    return bool(file_path) and file_path.endswith('.py') and not os.path.realpath(file_path).startswith(LIBRARY_PATHS)
+
+
+def _code_names(code):
+    """
+    Retourne les noms (globaux et attributs) utilisés par un objet code et par ses fonctions imbriquées.
+    """
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if inspect.iscode(constant):
+            names |= _code_names(constant)
+    return names
+
+
+def _describe_value(value, pending):
+    """
+    Décrit une valeur globale utilisée par une fonction ; les fonctions et classes rencontrées sont ajoutées à pending.
+    """
+    if inspect.isfunction(value) or inspect.isclass(value):
+        pending.append(value)
+        return f'{value.__module__}.{value.__qualname__}'
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}({", ".join(_describe_value(item, pending) for item in value)})'
+    if isinstance(value, (set, frozenset)):
+        return f'{type(value).__name__}({", ".join(sorted(_describe_value(item, pending) for item in value))})'
+    if isinstance(value, dict):
+        items = (f'{_describe_value(key, pending)}: {_describe_value(item, pending)}' for key, item in value.items())
+        return f'dict({", ".join(sorted(items))})'
+    description = repr(value)
+    # Les objets sans représentation stable (adresse mémoire) ne sont décrits que par leur type
+    return type(value).__qualname__ if ' at 0x' in description else description
+
+
+def _code_dependencies(func):
+    """
+    Retourne le code source des fonctions et classes locales dont dépend une fonction : elle-même puis, de proche en proche,
+    les objets désignés par les noms globaux utilisés dans leur code (hors bibliothèque standard et paquets installés),
+    ainsi que la valeur des constantes globales utilisées. Les autres fonctions des mêmes modules n'en font pas partie.
+    """
+    sources = {}
+    pending = [func]
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, (staticmethod, classmethod)) or inspect.ismethod(obj):
+            obj = obj.__func__
+        if isinstance(obj, property):
+            pending.extend(accessor for accessor in (obj.fget, obj.fset, obj.fdel) if accessor is not None)
+            continue
+        if not (inspect.isfunction(obj) or inspect.isclass(obj)) or not _is_local(obj):
+            continue
+        name = f'{obj.__module__}.{obj.__qualname__}'
+        if name in sources:
+            continue
+        sources[name] = _function_source(obj)
+
+        if inspect.isclass(obj):
+            # Classes de base et méthodes
+            pending.extend(obj.__mro__[1:])
+            pending.extend(vars(obj).values())
+            continue
+        names = _code_names(obj.__code__)
+        for global_name in sorted(names):
+            if global_name not in obj.__globals__:
+                continue
+            value = obj.__globals__[global_name]
+            if inspect.ismodule(value):
+                # Module local utilisé comme espace de noms : seuls ses attributs utilisés sont suivis
+                if _is_local(value):
+                    pending.extend(getattr(value, attribute) for attribute in names if hasattr(value, attribute))
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                pending.append(value)
+            else:
+                sources[f'{obj.__module__}.{global_name} (valeur)'] = _describe_value(value, pending)
+        for cell in obj.__closure__ or ():
+            try:
+                pending.append(cell.cell_contents)
+            except ValueError:
+                pass
+    return [f'{name}\n{source}' for name, source in sorted(sources.items())]
+
+
+class Pipeline:
+    def __init__(self, cache_dir='.pipeline_cache', max_bytes=2 ** 30):
+        """
+        Initialise le pipeline.
+
+        Parameters:
+        - cache_dir: str, le répertoire du cache
+        - max_bytes: int, la taille maximale du cache en octets
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stages = {}
+        self.computed = []
+        self._keys = {}
+        self._results = {}
+        self._file_hashes = {}
+
+    def add_stage(self, name, func, inputs=(), params=None, files=(), outputs=(), version=None):
+        """
+        Ajoute une étape au pipeline.
+
+        La fonction de l'étape est appelée avec les résultats des étapes `inputs` (dans l'ordre déclaré)
+        comme arguments positionnels, et avec `params` comme arguments nommés.
+
+        Parameters:
+        - name: str, le nom de l'étape
+        - func: callable, la fonction qui calcule le résultat de l'étape
+        - inputs: list of str, les étapes dont le résultat est passé à la fonction (déjà ajoutées)
+        - params: dict, les paramètres de l'étape (sérialisables en JSON)
+        - files: list of str, les fichiers lus par l'étape, dont le contenu entre dans la clé de cache
+        - outputs: list of str, les fichiers produits par l'étape, conservés dans le cache
+        - version: str, une version libre pour invalider manuellement le cache de l'étape
+        """
+        if name in self.stages:
+            raise ValueError(f"L'étape '{name}' existe déjà.")
+        for upstream in inputs:
+            if upstream not in self.stages:
+                raise ValueError(f"L'étape '{upstream}' doit être ajoutée avant l'étape '{name}'.")
+        self.stages[name] = Stage(name, func, tuple(inputs), dict(params or {}), tuple(files), tuple(outputs), version)
+
+    def stage_key(self, name):
+        """
+        Calcule la clé de cache d'une étape.
+
+        Parameters:
+        - name: str, le nom de l'étape
+
+        Returns:
+        - str, l'empreinte SHA-256 de l'étape et de toutes ses dépendances
+        """
+        if name not in self._keys:
+            stage = self.stages[name]
+            description = {
+                'name': stage.name,
+                'source': _function_source(stage.func),
+                'code': _code_dependencies(stage.func),
+                'params': stage.params,
+                'files': {file_path: self._hash_file(file_path) for file_path in stage.files},
+                'inputs': [self.stage_key(upstream) for upstream in stage.inputs],
+                'outputs': list(stage.outputs),
+                'version': stage.version,
+            }
+            encoded = json.dumps(description, sort_keys=True, default=repr).encode()
+            self._keys[name] = hashlib.sha256(encoded).hexdigest()
+        return self._keys[name]
+
+    def run(self, targets=None):
+        """
+        Exécute le pipeline en réutilisant les résultats mémorisés.
+
+        Les résultats des étapes en cache ne sont chargés que s'ils sont demandés ou nécessaires au
+        recalcul d'une étape en aval. La liste des étapes recalculées est disponible dans `computed`.
+
+        Parameters:
+        - targets: list of str, les étapes dont le résultat est demandé, ou None pour toutes les étapes
+
+        Returns:
+        - dict, le résultat de chaque étape demandée
+        """
+        self.computed = []
+        self._keys = {}
+        self._results = {}
+        self._file_hashes = {}
+        targets = list(self.stages) if targets is None else targets
+        return {name: self._result(name) for name in targets}
+
+    def _hash_file(self, file_path):
+        """
+        Calcule l'empreinte d'un fichier, une seule fois par exécution du pipeline.
+        """
+        if file_path not in self._file_hashes:
+            self._file_hashes[file_path] = _hash_file(file_path)
+        return self._file_hashes[file_path]
+
+    def _entry_path(self, key):
+        """
+        Retourne le chemin du fichier de cache associé à une clé.
+        """
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _result(self, name):
+        """
+        Retourne le résultat d'une étape, depuis le cache ou en le calculant.
+        """
+        if name in self._results:
+            return self._results[name]
+
+        stage = self.stages[name]
+        key = self.stage_key(name)
+        entry = self._load(key)
+        if entry is None:
+            args = [self._result(upstream) for upstream in stage.inputs]
+            result = stage.func(*args, **stage.params)
+            self.computed.append(name)
+            files = {}
+            for file_path in stage.outputs:
+                with open(file_path, 'rb') as file:
+                    files[file_path] = file.read()
+            self._store(key, {'result': result, 'files': files})
+        else:
+            result = entry['result']
+            # Restaurer les fichiers produits qui ont disparu ou été modifiés
+            for file_path, content in entry['files'].items():
+                if not os.path.exists(file_path) or _hash_file(file_path) != hashlib.sha256(content).hexdigest():
+                    with open(file_path, 'wb') as file:
+                        file.write(content)
+
+        self._results[name] = result
+        return result
+
+    def _load(self, key):
+        """
+        Charge une entrée du cache et met à jour sa date d'utilisation, ou retourne None si elle est absente
+        ou illisible (par exemple un objet sérialisé avec une version antérieure d'une classe, qui est alors recalculé).
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                entry = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        os.utime(entry_path)
+        return entry
+
+    def _store(self, key, entry):
+        """
+        Écrit une entrée dans le cache (écriture atomique), puis applique la limite de taille.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._entry_path(key))
+        self._evict(keep=self._entry_path(key))
+
+    def _evict(self, keep):
+        """
+        Supprime les entrées les moins récemment utilisées tant que le cache dépasse max_bytes.
+        """
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.pkl'):
+                entry_path = os.path.join(self.cache_dir, file_name)
+                status = os.stat(entry_path)
+                entries.append((status.st_mtime, status.st_size, entry_path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry_path != keep:
+                os.remove(entry_path)
+                total -= size
@@ -2,64 +2,232 @@
 Module: regression.py
 
 Description:
-Ce module implémente une classe pour effectuer la régression linéaire en utilisant la méthode des moindres carrés ordinaires (Ordinary Least Squares, OLS). 
+Ce module implémente une classe pour effectuer la régression linéaire en utilisant la méthode des moindres carrés ordinaires (Ordinary Least Squares, OLS).
 Il permet d'ajuster un modèle linéaire aux données, de faire des prédictions, et de calculer le coefficient de détermination (R^2).
+La réponse peut contenir plusieurs cibles (matrice (n_samples, n_targets)) : X^T X est alors factorisée une seule fois
+et les coefficients de toutes les cibles sont obtenus en une seule résolution à seconds membres multiples.
+L'ajustement conserve la factorisation de Cholesky de X^T X, ce qui permet d'obtenir les statistiques d'inférence
+(erreurs standard, statistiques t, p-values, F, VIF) sans réajuster le modèle.
+Les matrices creuses (scipy.sparse), les poids d'observation (moindres carrés pondérés) et les solveurs itératifs
+LSQR et gradient conjugué sur les équations normales sont également pris en charge, par exemple pour les designs
+one-hot très creux produits par `encoding.encode_categorical`, ainsi que les variables retardées de
+`features.LaggedDesign`, qui ne sont jamais matérialisées en entier.
+Avec le solveur 'cholesky', X^T W X et X^T W y sont accumulées par blocs de lignes, éventuellement en parallèle
+sur plusieurs threads (voir `gram.gram_matrix`), sans recopier X pour y ajouter la constante.
+La classe `RollingOLS` ajuste le modèle sur des fenêtres glissantes en mettant à jour X^T X et X^T y avec les lignes
+qui entrent et sortent de la fenêtre, au lieu de réajuster chaque fenêtre à partir de zéro.
 
 Utilisation:
-Ce module peut être utilisé pour ajuster un modèle de régression linéaire aux données en utilisant la classe `OrdinaryLeastSquares`. 
+Ce module peut être utilisé pour ajuster un modèle de régression linéaire aux données en utilisant la classe `OrdinaryLeastSquares`.
 Vous pouvez créer une instance de cette classe, ajuster le modèle avec les données d'entraînement, prédire les valeurs pour de nouvelles données, et obtenir les coefficients du modèle.
 
-Classe:
+Classes:
 - OrdinaryLeastSquares: Classe pour effectuer la régression linéaire en utilisant les moindres carrés ordinaires.
+- OLSResults: Classe regroupant les statistiques d'inférence d'un modèle ajusté.
+- RollingOLS: Classe pour ajuster les moindres carrés ordinaires sur des fenêtres glissantes.
 
 Méthodes:
-- __init__(self, intercept=True): Initialise le modèle des moindres carrés ordinaires.
-- fit(self, X, y): Calcule les coefficients des moindres carrés ordinaires.
+- __init__(self, intercept=True, solver='cholesky', tol=1e-10, max_iter=None, n_jobs=1, block_size=None): Initialise le modèle des moindres carrés ordinaires.
+- fit(self, X, y, sample_weight=None): Calcule les coefficients des moindres carrés ordinaires (éventuellement pondérés).
 - predict(self, X): Prédit les valeurs de y pour une nouvelle matrice de données X.
 - get_coeffs(self): Retourne les coefficients estimés du modèle.
 - determination_coefficient(self, X, y): Calcule le coefficient de détermination R^2.
+- get_results(self): Retourne un objet `OLSResults` avec les statistiques d'inférence.
+- RollingOLS.fit(self, X, y): Calcule les coefficients et le R^2 de chaque fenêtre glissante.
 """
 
+import warnings
+
 import numpy as np
+from scipy import linalg, sparse, stats
+from scipy.sparse.linalg import LinearOperator, cg, lsqr
+
+from .features import LaggedDesign
+from .gram import _default_block_size, _scale_rows, _to_dense, column_means, design_block, gram_matrix, row_blocks
+
+COV_TYPES = ('nonrobust', 'HC0', 'HC1', 'HC2', 'HC3')
+SOLVERS = ('cholesky', 'lsqr', 'cg')
+
 
 class OrdinaryLeastSquares:
-    def __init__(self, intercept=True):
+    def __init__(self, intercept=True, solver='cholesky', tol=1e-10, max_iter=None, n_jobs=1, block_size=None):
         """
         Initialise le modèle des moindres carrés ordinaires.
 
         Parameters:
         - intercept: bool, indique s'il faut ajouter une constante au modèle.
+        - solver: str, 'cholesky' (factorisation de X^T X), 'lsqr' ou 'cg' (solveurs itératifs
+          qui ne forment pas X^T X ; les statistiques d'inférence ne sont alors pas disponibles)
+        - tol: float, la tolérance des solveurs itératifs
+        - max_iter: int, le nombre maximal d'itérations des solveurs itératifs (None pour la valeur par défaut de scipy)
+        - n_jobs: int, le nombre de threads pour accumuler X^T X par blocs (None pour tous les cœurs)
+        - block_size: int, le nombre de lignes par bloc (None pour une taille adaptée au cache)
         """
+        if solver not in SOLVERS:
+            raise ValueError(f"Solveur inconnu : '{solver}'. Valeurs possibles : {SOLVERS}.")
         self.intercept = intercept
+        self.solver = solver
+        self.tol = tol
+        self.max_iter = max_iter
+        self.n_jobs = n_jobs
+        self.block_size = block_size
         self.coeffs = None
+        self.n_samples = None
+        self._cho = None
+        self._shift = None
 
-    def fit(self, X, y):
+    def fit(self, X, y, sample_weight=None):
         """
         Calcule les coefficients des moindres carrés ordinaires.
 
         Parameters:
-        - X: ndarray, matrice des variables explicatives (n_samples, n_features)
-        - y: ndarray, vecteur des réponses (n_samples,)
+        - X: ndarray, scipy.sparse matrix or LaggedDesign, matrice des variables explicatives (n_samples, n_features)
+        - y: ndarray, vecteur des réponses (n_samples,) ou matrice des réponses (n_samples, n_targets)
+        - sample_weight: ndarray, poids des observations (n_samples,), ou None pour des poids égaux
         """
+        if sparse.issparse(X):
+            X = sparse.csr_matrix(X, dtype=float)
+        elif isinstance(X, LaggedDesign):
+            # Les variables retardées restent une vue : seuls des blocs de lignes sont matérialisés
+            if self.solver != 'cholesky':
+                raise ValueError("Un LaggedDesign ne peut être ajusté qu'avec solver='cholesky'.")
+        else:
+            X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if y.shape[0] != X.shape[0]:
+            raise ValueError("y doit avoir autant de lignes que X (n_samples).")
+
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight, dtype=float)
+            if sample_weight.shape != (X.shape[0],):
+                raise ValueError("sample_weight doit être un vecteur de longueur n_samples.")
+
+        # Avec une constante, le modèle est ajusté sur y et X recentrés par leurs moyennes : les statistiques
+        # suffisantes sont alors des sommes centrées, sans perte de précision quand les moyennes sont grandes
+        # devant les écarts (les designs creux ne sont pas recentrés pour ne pas les densifier)
+        y_shift = np.average(y, axis=0, weights=sample_weight) if self.intercept else 0.0
+        centered_y = y - y_shift
+        if sample_weight is not None:
+            weighted_y = sample_weight.reshape((-1,) + (1,) * (y.ndim - 1)) * centered_y
+        else:
+            weighted_y = centered_y
+        shift = None
+        if self.intercept and self.solver == 'cholesky' and not sparse.issparse(X):
+            shift = column_means(X, sample_weight, self.block_size)
+
+        if self.solver == 'cholesky':
+            # Estimation des coefficients β̂ = (X^T W X)^-1 X^T W y par factorisation de Cholesky de X^T W X,
+            # résolue pour toutes les cibles à la fois si y a plusieurs colonnes
+            gram, Xty = gram_matrix(X, centered_y, sample_weight=sample_weight, intercept=self.intercept,
+                                    block_size=self.block_size, n_jobs=self.n_jobs, shift=shift)
+            self._cho = linalg.cho_factor(gram)
+            coeffs = linalg.cho_solve(self._cho, Xty)
+        else:
+            if self.intercept:
+                if sparse.issparse(X):
+                    design = sparse.hstack((np.ones((X.shape[0], 1)), X), format='csr')
+                else:
+                    design = np.hstack((np.ones((X.shape[0], 1)), X))
+            else:
+                design = X
+            gram = None
+            self._cho = None
+            Xty = _to_dense(design.T @ weighted_y)
+            coeffs = self._solve_iterative(design, centered_y, sample_weight, Xty)
+
+        # Retour aux variables d'origine : la constante absorbe les moyennes retranchées
+        self.coeffs = coeffs.copy()
         if self.intercept:
-            X = np.hstack((np.ones((X.shape[0], 1)), X))
+            self.coeffs[0] += y_shift
+            if shift is not None:
+                self.coeffs[0] -= shift @ coeffs[1:]
+
+        # Statistiques suffisantes (centrées si le modèle a une constante) conservées pour l'inférence
+        self.n_samples = X.shape[0]
+        self._shift = shift
+        self._centered_coeffs = coeffs
+        self._gram = gram
+        self._Xty = Xty
+        self._yty = np.sum(weighted_y * centered_y, axis=0)
+        self._y_sum = np.sum(weighted_y, axis=0)
+        self._weight_sum = self.n_samples if sample_weight is None else np.sum(sample_weight)
+        self._X = X
+        self._y = y
+        self._sample_weight = sample_weight
+
+    def __getstate__(self):
+        """
+        Exclut les données d'entraînement de la sérialisation (pickle) : seuls les coefficients, la
+        factorisation et les statistiques suffisantes sont conservés.
+        """
+        state = self.__dict__.copy()
+        for name in ('_X', '_y', '_sample_weight'):
+            state.pop(name, None)
+        return state
 
-        # Estimation des coefficients β̂ = (X^T X)^-1 X^T y
-        X_transpose = X.T
-        self.coeffs = np.linalg.inv(X_transpose @ X) @ X_transpose @ y
+    def _training_data(self):
+        """
+        Retourne les données d'entraînement (X, y, poids), qui ne sont pas conservées après sérialisation.
+        """
+        if not hasattr(self, '_X'):
+            raise ValueError("Les données d'entraînement ne sont pas conservées par la sérialisation : "
+                             "réajuster le modèle pour calculer les résidus et les covariances robustes.")
+        return self._X, self._y, self._sample_weight
+
+    def _solve_iterative(self, X, y, sample_weight, Xty):
+        """
+        Résout les moindres carrés cible par cible avec LSQR ou le gradient conjugué sur les équations normales.
+
+        Parameters:
+        - X: ndarray or scipy.sparse matrix, matrice du modèle (constante incluse)
+        - y: ndarray, les réponses
+        - sample_weight: ndarray or None, les poids des observations
+        - Xty: ndarray, le second membre X^T W y des équations normales
+
+        Returns:
+        - ndarray, les coefficients estimés, de même forme que Xty
+        """
+        targets = y.reshape(X.shape[0], -1)
+        rhs = Xty.reshape(X.shape[1], -1)
+        coeffs = np.empty(rhs.shape)
+        weights = np.ones(X.shape[0]) if sample_weight is None else sample_weight
+
+        if self.solver == 'lsqr':
+            # LSQR sur le problème blanchi min ||W^1/2 (y - X β)||
+            sqrt_weights = np.sqrt(weights)
+            design = _scale_rows(X, sqrt_weights)
+            for k in range(targets.shape[1]):
+                result = lsqr(design, sqrt_weights * targets[:, k], atol=self.tol, btol=self.tol,
+                              iter_lim=self.max_iter)
+                coeffs[:, k] = result[0]
+                if result[1] == 7:
+                    warnings.warn("LSQR a atteint le nombre maximal d'itérations sans converger.")
+        else:
+            # Gradient conjugué sur X^T W X β = X^T W y, sans former X^T W X
+            operator = LinearOperator((X.shape[1], X.shape[1]), matvec=lambda v: X.T @ (weights * (X @ v)),
+                                      dtype=float)
+            for k in range(rhs.shape[1]):
+                coeffs[:, k], info = cg(operator, rhs[:, k], rtol=self.tol, maxiter=self.max_iter)
+                if info > 0:
+                    warnings.warn("Le gradient conjugué a atteint le nombre maximal d'itérations sans converger.")
+
+        return coeffs.reshape(Xty.shape)
 
     def predict(self, X):
         """
         Prédit les valeurs de y pour une nouvelle matrice de données X.
 
         Parameters:
-        - X: ndarray, matrice des variables explicatives (n_samples, n_features)
+        - X: ndarray, scipy.sparse matrix or LaggedDesign, matrice des variables explicatives (n_samples, n_features)
 
         Returns:
-        - ndarray, vecteur des prédictions (n_samples,)
+        - ndarray, vecteur des prédictions (n_samples,) ou matrice (n_samples, n_targets) pour un modèle multi-cibles
         """
+        if not sparse.issparse(X) and not isinstance(X, LaggedDesign):
+            X = np.asarray(X)
         if self.intercept:
-            X = np.hstack((np.ones((X.shape[0], 1)), X))
+            # Ajouter la constante sans recopier X dans une matrice élargie
+            return X @ self.coeffs[1:] + self.coeffs[0]
 
         return X @ self.coeffs
 
@@ -68,7 +236,7 @@ class OrdinaryLeastSquares:
         Retourne les coefficients estimés du modèle.
 
         Returns:
-        - ndarray, les coefficients estimés (n_features,)
+        - ndarray, les coefficients estimés (n_features,) ou (n_features, n_targets) pour un modèle multi-cibles
         """
         return self.coeffs
 
@@ -78,13 +246,387 @@ class OrdinaryLeastSquares:
 
         Parameters:
         - X: ndarray, matrice des variables explicatives (n_samples, n_features)
-        - y: ndarray, vecteur des réponses (n_samples,)
+        - y: ndarray, vecteur des réponses (n_samples,) ou matrice des réponses (n_samples, n_targets)
 
         Returns:
-        - float, le coefficient de détermination R^2
+        - float, le coefficient de détermination R^2, ou ndarray (n_targets,) avec un R^2 par cible
         """
         y_pred = self.predict(X)
-        ss_total = np.sum((y - np.mean(y)) ** 2)
-        ss_residual = np.sum((y - y_pred) ** 2)
+        ss_total = np.sum((y - np.mean(y, axis=0)) ** 2, axis=0)
+        ss_residual = np.sum((y - y_pred) ** 2, axis=0)
         r_squared = 1 - (ss_residual / ss_total)
         return r_squared
+
+    def get_results(self):
+        """
+        Retourne les statistiques d'inférence du modèle ajusté.
+
+        Returns:
+        - OLSResults, l'objet regroupant les statistiques d'inférence
+        """
+        if self.coeffs is None:
+            raise ValueError("Le modèle doit être ajusté avec fit() avant d'obtenir les résultats.")
+        if self._cho is None:
+            raise ValueError("Les statistiques d'inférence nécessitent solver='cholesky'.")
+        return OLSResults(self)
+
+
+class OLSResults:
+    """
+    Statistiques d'inférence d'un modèle `OrdinaryLeastSquares` ajusté.
+
+    Toutes les quantités sont dérivées de la factorisation de Cholesky de X^T X et des statistiques
+    suffisantes (X^T y, y^T y, somme de y) conservées par `fit`, calculées sur les variables recentrées
+    si le modèle a une constante. Seules les covariances robustes (HC0 à HC3) nécessitent les résidus
+    individuels, et donc les données d'entraînement. Pour un ajustement pondéré, les statistiques
+    sont celles des moindres carrés pondérés (résidus blanchis par W^1/2).
+
+    Pour un modèle multi-cibles, les quantités par cible (ssr, r_squared, erreurs standard, ...) ont
+    une dimension supplémentaire en dernière position, comme les coefficients (n_params, n_targets).
+
+    Attributes:
+    - params: ndarray, les coefficients estimés
+    - nobs: int, le nombre d'observations
+    - df_model: int, le nombre de degrés de liberté du modèle (hors constante)
+    - df_resid: int, le nombre de degrés de liberté des résidus
+    - ssr: float or ndarray, la somme des carrés des résidus
+    - tss: float or ndarray, la somme totale des carrés (centrée si le modèle a une constante)
+    - r_squared: float or ndarray, le coefficient de détermination R^2
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.params = model.coeffs
+        self.nobs = model.n_samples
+        n_params = self.params.shape[0]
+        self.df_model = n_params - int(model.intercept)
+        self.df_resid = self.nobs - n_params
+
+        # SCR = y^T y - β̂^T X^T y, car X^T X β̂ = X^T y (sur les variables recentrées)
+        self.ssr = np.maximum(model._yty - np.sum(model._centered_coeffs * model._Xty, axis=0), 0.0)
+        if model.intercept:
+            self.tss = model._yty - model._y_sum ** 2 / model._weight_sum
+        else:
+            self.tss = model._yty
+        self.r_squared = 1 - self.ssr / self.tss
+        self._centered_inv_gram = None
+        self._leverage = None
+
+    def _uncenter(self, matrix):
+        """
+        Ramène une matrice (n_params, n_params) calculée sur les variables recentrées aux variables d'origine.
+
+        Avec les lignes recentrées x̃ = A x, A = [[1, 0], [-m, I]], une matrice M̃ devient A^T M̃ A.
+        """
+        shift = self.model._shift
+        if shift is None:
+            return matrix
+        transform = np.eye(self.params.shape[0])
+        transform[0, 1:] = -shift
+        return transform @ matrix @ transform.T
+
+    def _centered_inverse_gram(self):
+        """
+        Retourne l'inverse de la matrice de Gram des variables recentrées, obtenue à partir de la factorisation de Cholesky.
+        """
+        if self._centered_inv_gram is None:
+            identity = np.eye(self.params.shape[0])
+            # Ordre C : les produits creux X @ (X^T X)^-1 des effets de levier parcourent les lignes
+            self._centered_inv_gram = np.ascontiguousarray(linalg.cho_solve(self.model._cho, identity))
+        return self._centered_inv_gram
+
+    def residual_variance(self):
+        """
+        Calcule la variance résiduelle σ̂² = SCR / (n - p).
+
+        Returns:
+        - float or ndarray, la variance résiduelle (une par cible)
+        """
+        return self.ssr / self.df_resid
+
+    def adjusted_r_squared(self):
+        """
+        Calcule le coefficient de détermination ajusté.
+
+        Returns:
+        - float or ndarray, le R^2 ajusté (un par cible)
+        """
+        df_total = self.nobs - int(self.model.intercept)
+        return 1 - (1 - self.r_squared) * df_total / self.df_resid
+
+    def inverse_gram(self):
+        """
+        Retourne (X^T X)^-1, obtenue à partir de la factorisation de Cholesky.
+
+        Returns:
+        - ndarray, la matrice (X^T X)^-1 (n_params, n_params)
+        """
+        return self._uncenter(self._centered_inverse_gram())
+
+    def residuals(self):
+        """
+        Calcule les résidus du modèle sur les données d'entraînement.
+
+        Returns:
+        - ndarray, vecteur des résidus (n_samples,) ou matrice (n_samples, n_targets)
+        """
+        X, y, _ = self.model._training_data()
+        return y - self.model.predict(X)
+
+    def leverage(self):
+        """
+        Calcule les effets de levier h_ii = x_i^T (X^T X)^-1 x_i.
+
+        Returns:
+        - ndarray, vecteur des effets de levier (n_samples,)
+        """
+        if self._leverage is None:
+            # Avec X^T W X = U^T U, h_ii = w_i ||U^-T x_i||^2, calculé par blocs de lignes
+            # (h_ii ne dépend pas du recentrage des variables, les lignes sont recentrées comme pour U)
+            model = self.model
+            X, _, sample_weight = model._training_data()
+            block_size = model.block_size or _default_block_size(self.params.shape[0])
+            self._leverage = np.empty(self.nobs)
+            for start, stop in row_blocks(self.nobs, block_size):
+                self._leverage[start:stop] = self._block_leverage(X, start, stop)
+            if sample_weight is not None:
+                self._leverage *= sample_weight
+        return self._leverage
+
+    def _block_leverage(self, X, start, stop):
+        """
+        Calcule les effets de levier (non pondérés) d'un bloc de lignes.
+        """
+        model = self.model
+        if sparse.issparse(X):
+            # Design creux : h_ii = x_i^T (X^T W X)^-1 x_i ne coûte que nnz(x_i) * p par ligne,
+            # au lieu d'une résolution triangulaire dense en p^2 par ligne
+            design = X[start:stop]
+            if model.intercept:
+                design = sparse.hstack((np.ones((stop - start, 1)), design), format='csr')
+            return np.asarray(design.multiply(design @ self._centered_inverse_gram()).sum(axis=1)).ravel()
+
+        design = design_block(X, start, stop, intercept=model.intercept)
+        if model._shift is not None:
+            design[:, 1:] -= model._shift
+        factor, lower = model._cho
+        if lower:
+            solved = linalg.solve_triangular(factor, design.T, lower=True)
+        else:
+            solved = linalg.solve_triangular(factor, design.T, trans='T')
+        return np.sum(solved ** 2, axis=0)
+
+    def cov_params(self, cov_type='nonrobust'):
+        """
+        Calcule la matrice de covariance des coefficients.
+
+        Parameters:
+        - cov_type: str, 'nonrobust' pour la covariance classique σ̂² (X^T X)^-1,
+          ou 'HC0', 'HC1', 'HC2', 'HC3' pour les covariances robustes à l'hétéroscédasticité
+
+        Returns:
+        - ndarray, la matrice de covariance (n_params, n_params), ou (n_targets, n_params, n_params)
+          pour un modèle multi-cibles
+        """
+        if cov_type not in COV_TYPES:
+            raise ValueError(f"Type de covariance inconnu : '{cov_type}'. Valeurs possibles : {COV_TYPES}.")
+
+        if cov_type == 'nonrobust':
+            return np.multiply.outer(self.residual_variance(), self.inverse_gram())
+
+        # Estimateur sandwich (X^T W X)^-1 X^T W diag(ω) W X (X^T W X)^-1, ω calculé sur les résidus blanchis
+        residuals = self.residuals()
+        X, _, sample_weight = self.model._training_data()
+        if sample_weight is not None:
+            residuals = residuals * np.sqrt(sample_weight).reshape((-1,) + (1,) * (residuals.ndim - 1))
+        omega = residuals ** 2
+        if cov_type == 'HC1':
+            omega = omega * self.nobs / self.df_resid
+        elif cov_type == 'HC2':
+            omega = omega / (1 - self.leverage())
+        elif cov_type == 'HC3':
+            omega = omega / (1 - self.leverage()) ** 2
+
+        model = self.model
+        weights = omega.reshape(self.nobs, -1)
+        if sample_weight is not None:
+            weights = weights * sample_weight[:, None]
+        # X^T diag(ω) X est une matrice de Gram pondérée, calculée par le même moteur que fit,
+        # sur les variables recentrées puis ramenée aux variables d'origine
+        inv_gram = self._centered_inverse_gram()
+        meat = np.stack([gram_matrix(X, sample_weight=weights[:, k], intercept=model.intercept,
+                                     block_size=model.block_size, n_jobs=model.n_jobs, shift=model._shift)[0]
+                         for k in range(weights.shape[1])])
+        cov = self._uncenter(inv_gram @ meat @ inv_gram)
+        return cov if omega.ndim > 1 else cov[0]
+
+    def standard_errors(self, cov_type='nonrobust'):
+        """
+        Calcule les erreurs standard des coefficients.
+
+        Parameters:
+        - cov_type: str, le type de covariance (voir `cov_params`)
+
+        Returns:
+        - ndarray, les erreurs standard (n_params,) ou (n_params, n_targets)
+        """
+        variances = np.diagonal(self.cov_params(cov_type), axis1=-2, axis2=-1)
+        return np.sqrt(variances).T
+
+    def t_statistics(self, cov_type='nonrobust'):
+        """
+        Calcule les statistiques t des coefficients.
+
+        Parameters:
+        - cov_type: str, le type de covariance (voir `cov_params`)
+
+        Returns:
+        - ndarray, les statistiques t (n_params,) ou (n_params, n_targets)
+        """
+        return self.params / self.standard_errors(cov_type)
+
+    def p_values(self, cov_type='nonrobust'):
+        """
+        Calcule les p-values bilatérales des coefficients (loi de Student à n - p degrés de liberté).
+
+        Parameters:
+        - cov_type: str, le type de covariance (voir `cov_params`)
+
+        Returns:
+        - ndarray, les p-values (n_params,) ou (n_params, n_targets)
+        """
+        return 2 * stats.t.sf(np.abs(self.t_statistics(cov_type)), self.df_resid)
+
+    def f_statistic(self):
+        """
+        Calcule la statistique F de significativité globale du modèle et sa p-value.
+
+        Returns:
+        - tuple, la statistique F et sa p-value (une par cible pour un modèle multi-cibles)
+        """
+        f_value = ((self.tss - self.ssr) / self.df_model) / (self.ssr / self.df_resid)
+        return f_value, stats.f.sf(f_value, self.df_model, self.df_resid)
+
+    def vif(self):
+        """
+        Calcule le facteur d'inflation de la variance (VIF) de chaque variable explicative.
+
+        Le VIF de la variable j vaut [(X^T X)^-1]_jj multiplié par sa somme des carrés (centrée si le
+        modèle a une constante), ce qui évite une régression auxiliaire par variable.
+
+        Returns:
+        - ndarray, les VIF des variables explicatives (n_features,)
+        """
+        # Les éléments diagonaux des variables explicatives ne dépendent pas du recentrage
+        inv_gram = self._centered_inverse_gram()
+        gram = self.model._gram
+        if self.model.intercept:
+            sums = gram[0, 1:]
+            squares = np.diag(gram)[1:] - sums ** 2 / self.model._weight_sum
+            return np.diag(inv_gram)[1:] * squares
+        return np.diag(inv_gram) * np.diag(gram)
+
+
+class RollingOLS(OrdinaryLeastSquares):
+    def __init__(self, window, step=1, intercept=True, refresh=1000):
+        """
+        Initialise le modèle des moindres carrés ordinaires sur fenêtres glissantes.
+
+        Parameters:
+        - window: int, le nombre de lignes de chaque fenêtre
+        - step: int, le nombre de lignes dont la fenêtre avance à chaque pas
+        - intercept: bool, indique s'il faut ajouter une constante au modèle.
+        - refresh: int, nombre de fenêtres après lequel X^T X est recalculée exactement pour éviter
+          l'accumulation d'erreurs d'arrondi (None pour ne jamais recalculer)
+        """
+        super().__init__(intercept=intercept)
+        if window < 1 or step < 1:
+            raise ValueError("window et step doivent être des entiers strictement positifs.")
+        self.window = window
+        self.step = step
+        self.refresh = refresh
+        self.rolling_coeffs = None
+        self.rolling_r_squared = None
+        self.window_ends = None
+
+    def fit(self, X, y):
+        """
+        Calcule les coefficients et le R^2 de chaque fenêtre glissante.
+
+        Entre deux fenêtres, les contributions des lignes qui entrent sont ajoutées à X^T X, X^T y, y^T y
+        et à la somme de y, et celles des lignes qui sortent en sont retranchées : chaque pas coûte
+        O(step * p^2) plus la factorisation p x p, au lieu de O(window * p^2) pour un réajustement.
+        Les fenêtres dont X^T X n'est pas inversible (par exemple une colonne constante nulle) ont des
+        coefficients et un R^2 égaux à NaN.
+
+        Après l'ajustement, le modèle se comporte comme un `OrdinaryLeastSquares` ajusté sur la dernière
+        fenêtre (`predict`, `get_coeffs`, `get_results`).
+
+        Parameters:
+        - X: ndarray, matrice des variables explicatives (n_samples, n_features)
+        - y: ndarray, vecteur des réponses (n_samples,) ou matrice des réponses (n_samples, n_targets)
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n_samples = X.shape[0]
+        if n_samples < self.window:
+            raise ValueError("Le nombre d'observations doit être au moins égal à la taille de la fenêtre.")
+
+        starts = np.arange(0, n_samples - self.window + 1, self.step)
+        n_params = X.shape[1] + int(self.intercept)
+        self.rolling_coeffs = np.full((len(starts), n_params) + y.shape[1:], np.nan)
+        self.rolling_r_squared = np.full((len(starts),) + y.shape[1:], np.nan)
+        self.window_ends = starts + self.window
+
+        # Variables recentrées par leurs moyennes globales, pour limiter les erreurs d'arrondi des sommes
+        x_mean = X.mean(axis=0) if self.intercept else 0.0
+        y_mean = y.mean(axis=0) if self.intercept else 0.0
+        X_full, y_full = X, y
+        X = X - x_mean
+        y = y - y_mean
+
+        for k, start in enumerate(starts):
+            stop = start + self.window
+            recompute = (k == 0 or self.step >= self.window
+                         or self.refresh is not None and k % self.refresh == 0)
+            if not recompute:
+                # Mise à jour : ajout des lignes entrantes, retrait des lignes sortantes
+                self._update(X, y, stop - self.step, stop, 1.0)
+                self._update(X, y, start - self.step, start, -1.0)
+            else:
+                gram, Xty = gram_matrix(X[start:stop], y[start:stop], intercept=self.intercept)
+                self._gram = gram
+                self._Xty = Xty
+                self._yty = np.sum(y[start:stop] ** 2, axis=0)
+                self._y_sum = np.sum(y[start:stop], axis=0)
+
+            try:
+                cho = linalg.cho_factor(self._gram, check_finite=False)
+            except linalg.LinAlgError:
+                continue
+            coeffs = linalg.cho_solve(cho, self._Xty, check_finite=False)
+            ssr = self._yty - np.sum(coeffs * self._Xty, axis=0)
+            tss = self._yty - self._y_sum ** 2 / self.window if self.intercept else self._yty
+            if self.intercept:
+                coeffs[0] += y_mean - x_mean @ coeffs[1:]
+            self.rolling_coeffs[k] = coeffs
+            self.rolling_r_squared[k] = 1 - ssr / tss
+
+        # Le modèle résultant correspond à la dernière fenêtre
+        last = slice(starts[-1], starts[-1] + self.window)
+        try:
+            super().fit(X_full[last], y_full[last])
+        except linalg.LinAlgError:
+            self.coeffs = None
+            self._cho = None
+
+    def _update(self, X, y, start, stop, sign):
+        """
+        Ajoute (sign=1) ou retranche (sign=-1) la contribution des lignes [start, stop) aux statistiques suffisantes.
+        """
+        # Quelques lignes seulement : le bloc du modèle est formé directement
+        rows = design_block(X, start, stop, intercept=self.intercept)
+        self._gram = self._gram + sign * (rows.T @ rows)
+        self._Xty = self._Xty + sign * (rows.T @ y[start:stop])
+        self._yty = self._yty + sign * np.sum(y[start:stop] ** 2, axis=0)
+        self._y_sum = self._y_sum + sign * np.sum(y[start:stop], axis=0)
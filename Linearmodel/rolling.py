@@ -0,0 +1,430 @@
+"""
+Module: rolling.py
+
+Description:
+Ce module fournit des statistiques sur fenêtres glissantes (moyenne, variance, écart type, covariance, corrélation,
+minimum et maximum) calculées pour toutes les colonnes numériques à la fois. La moyenne, la variance et la covariance
+sont obtenues en O(n) par colonne à partir de sommes cumulées de données recentrées (une variante de Welford est
+disponible pour la variance), et le minimum et le maximum à l'aide de files monotones. La classe `RollingStatistics`
+permet de traiter les données par morceaux successifs en conservant uniquement la fin du morceau précédent.
+
+Utilisation:
+Ce module peut être utilisé en appelant les fonctions avec un DataFrame Pandas et une taille de fenêtre en nombre de lignes,
+par exemple `window_length('24h')` pour des données au pas de 15 minutes. Comme `calculate_variance` et `calculate_std`,
+la variance est normalisée par la taille de la fenêtre (ddof=0). Les données ne doivent pas contenir de valeurs manquantes
+(voir `load_data`), et les lignes qui précèdent la première fenêtre complète valent NaN.
+
+Fonctions:
+- window_length(duration, freq='15min'): Convertit une durée ('1h', '24h', '7D') en nombre de lignes.
+- rolling_mean(data, window, columns=None): Calcule la moyenne glissante des colonnes.
+- rolling_variance(data, window, columns=None, ddof=0, method='prefix'): Calcule la variance glissante des colonnes.
+- rolling_std(data, window, columns=None, ddof=0, method='prefix'): Calcule l'écart type glissant des colonnes.
+- rolling_covariance(data, window, column1, column2, ddof=0): Calcule la covariance glissante entre deux colonnes.
+- rolling_correlation(data, window, column1, column2): Calcule la corrélation glissante entre deux colonnes.
+- rolling_covariance_matrix(data, window, columns=None, ddof=0): Calcule les covariances glissantes de toutes les paires de colonnes.
+- rolling_correlation_matrix(data, window, columns=None): Calcule les corrélations glissantes de toutes les paires de colonnes.
+- rolling_min(data, window, columns=None): Calcule le minimum glissant des colonnes.
+- rolling_max(data, window, columns=None): Calcule le maximum glissant des colonnes.
+
+Classe:
+- RollingStatistics: Calcule les statistiques glissantes sur des données reçues par morceaux.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+STATISTICS = ('mean', 'variance', 'std', 'min', 'max')
+
+# Statistiques par paire de colonnes, calculées par RollingStatistics sur demande uniquement
+PAIRWISE_STATISTICS = ('covariance', 'correlation')
+
+
+def window_length(duration, freq='15min'):
+    """
+    Convertit une durée en nombre de lignes pour des données échantillonnées à pas constant.
+
+    Paramètres :
+    - duration : str, la durée de la fenêtre, par exemple '1h', '24h' ou '7D'
+    - freq : str, le pas d'échantillonnage des données
+
+    Retourne :
+    - int, le nombre de lignes de la fenêtre
+    """
+    rows = pd.Timedelta(duration) / pd.Timedelta(freq)
+    if rows < 1 or rows != int(rows):
+        raise ValueError(f"La durée '{duration}' n'est pas un multiple du pas '{freq}'.")
+    return int(rows)
+
+
+def _values(data, columns):
+    """
+    Retourne les colonnes sélectionnées (toutes les colonnes numériques par défaut) et leurs valeurs.
+    """
+    if columns is None:
+        columns = data.select_dtypes(include=[np.number]).columns.tolist()
+    for column in columns:
+        if column not in data.columns:
+            raise ValueError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
+    return columns, data[columns].to_numpy(dtype=float)
+
+
+def _check_window(window):
+    """
+    Vérifie que la taille de la fenêtre est strictement positive.
+    """
+    if window < 1:
+        raise ValueError("La taille de la fenêtre doit être un entier strictement positif.")
+
+
+def _window_sums(values, window):
+    """
+    Calcule les sommes glissantes des lignes par différence de sommes cumulées.
+
+    Retourne un tableau de même forme que values, avec NaN avant la première fenêtre complète.
+    """
+    sums = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return sums
+    cumulative = np.cumsum(values, axis=0)
+    sums[window - 1] = cumulative[window - 1]
+    sums[window:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+def _centered(values):
+    """
+    Recentre les colonnes sur leur première valeur pour limiter les erreurs d'arrondi des sommes cumulées.
+    """
+    return values - values[:1] if len(values) else values
+
+
+def _to_frame(result, data, columns):
+    """
+    Construit un DataFrame de résultats indexé comme les données.
+    """
+    return pd.DataFrame(result, index=data.index, columns=columns)
+
+
+def rolling_mean(data, window, columns=None):
+    """
+    Calcule la moyenne glissante des colonnes à partir de sommes cumulées.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+
+    Retourne :
+    - DataFrame, la moyenne de la fenêtre se terminant à chaque ligne
+    """
+    columns, values = _values(data, columns)
+    _check_window(window)
+    shift = values[:1]
+    mean = _window_sums(_centered(values), window) / window + shift
+    return _to_frame(mean, data, columns)
+
+
+def _variance_prefix(values, window, ddof):
+    """
+    Variance glissante à partir des sommes cumulées des valeurs recentrées et de leurs carrés.
+    """
+    centered = _centered(values)
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered ** 2, window)
+    return np.maximum(squares - sums ** 2 / window, 0.0) / (window - ddof)
+
+
+def _variance_welford(values, window, ddof):
+    """
+    Variance glissante par l'algorithme de Welford, avec retrait de la valeur qui sort de la fenêtre.
+    """
+    variance = np.full(values.shape, np.nan)
+    mean = np.zeros(values.shape[1])
+    m2 = np.zeros(values.shape[1])
+    for i, x in enumerate(values):
+        if i < window:
+            delta = x - mean
+            mean = mean + delta / (i + 1)
+            m2 = m2 + delta * (x - mean)
+        else:
+            old = values[i - window]
+            new_mean = mean + (x - old) / window
+            m2 = m2 + (x - old) * (x - new_mean + old - mean)
+            mean = new_mean
+        if i >= window - 1:
+            variance[i] = np.maximum(m2, 0.0) / (window - ddof)
+    return variance
+
+
+def rolling_variance(data, window, columns=None, ddof=0, method='prefix'):
+    """
+    Calcule la variance glissante des colonnes.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+    - ddof : int, la correction du nombre de degrés de liberté (0 : division par la taille de la fenêtre)
+    - method : str, 'prefix' (sommes cumulées, vectorisé) ou 'welford' (mise à jour incrémentale, plus stable)
+
+    Retourne :
+    - DataFrame, la variance de la fenêtre se terminant à chaque ligne
+    """
+    columns, values = _values(data, columns)
+    _check_window(window)
+    if method == 'prefix':
+        variance = _variance_prefix(values, window, ddof)
+    elif method == 'welford':
+        variance = _variance_welford(values, window, ddof)
+    else:
+        raise ValueError(f"Méthode inconnue : '{method}'. Valeurs possibles : ('prefix', 'welford').")
+    return _to_frame(variance, data, columns)
+
+
+def rolling_std(data, window, columns=None, ddof=0, method='prefix'):
+    """
+    Calcule l'écart type glissant des colonnes.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+    - ddof : int, la correction du nombre de degrés de liberté
+    - method : str, 'prefix' ou 'welford' (voir `rolling_variance`)
+
+    Retourne :
+    - DataFrame, l'écart type de la fenêtre se terminant à chaque ligne
+    """
+    return np.sqrt(rolling_variance(data, window, columns, ddof=ddof, method=method))
+
+
+def rolling_covariance(data, window, column1, column2, ddof=0):
+    """
+    Calcule la covariance glissante entre deux colonnes à partir de sommes cumulées.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - column1 : str, le nom de la première colonne
+    - column2 : str, le nom de la deuxième colonne
+    - ddof : int, la correction du nombre de degrés de liberté
+
+    Retourne :
+    - Series, la covariance de la fenêtre se terminant à chaque ligne
+    """
+    _, values = _values(data, [column1, column2])
+    _check_window(window)
+    centered = _centered(values)
+    sums = _window_sums(centered, window)
+    products = _window_sums(centered[:, [0]] * centered[:, [1]], window)[:, 0]
+    covariance = (products - sums[:, 0] * sums[:, 1] / window) / (window - ddof)
+    return pd.Series(covariance, index=data.index, name=f'Covariance {column1} vs {column2}')
+
+
+def rolling_correlation(data, window, column1, column2):
+    """
+    Calcule la corrélation glissante entre deux colonnes.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - column1 : str, le nom de la première colonne
+    - column2 : str, le nom de la deuxième colonne
+
+    Retourne :
+    - Series, la corrélation de la fenêtre se terminant à chaque ligne (NaN si une colonne est constante)
+    """
+    covariance = rolling_covariance(data, window, column1, column2).to_numpy()
+    variance = rolling_variance(data, window, [column1, column2]).to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / np.sqrt(variance[:, 0] * variance[:, 1])
+    correlation[~np.isfinite(correlation)] = np.nan
+    return pd.Series(correlation, index=data.index, name=f'Correlation {column1} vs {column2}')
+
+
+def _covariance_matrices(values, window, ddof):
+    """
+    Matrices de covariance glissantes (n, p, p) à partir des sommes cumulées des produits croisés recentrés.
+    """
+    centered = _centered(values)
+    sums = _window_sums(centered, window)
+    products = _window_sums(np.einsum('ni,nj->nij', centered, centered), window)
+    return (products - sums[:, :, None] * sums[:, None, :] / window) / (window - ddof)
+
+
+def _to_pairwise_frame(result, data, columns):
+    """
+    Construit un DataFrame de matrices (une par ligne des données), indexé par (ligne, colonne) comme `DataFrame.rolling().cov()`.
+    """
+    index = pd.MultiIndex.from_product([data.index, columns])
+    return pd.DataFrame(result.reshape(-1, len(columns)), index=index, columns=columns)
+
+
+def rolling_covariance_matrix(data, window, columns=None, ddof=0):
+    """
+    Calcule les covariances glissantes de toutes les paires de colonnes à la fois.
+
+    Les produits croisés de toutes les paires sont cumulés en une seule opération vectorisée :
+    le coût est O(n * p^2) pour p colonnes, au lieu d'un appel à `rolling_covariance` par paire.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+    - ddof : int, la correction du nombre de degrés de liberté
+
+    Retourne :
+    - DataFrame, indexé par (ligne, colonne), la matrice de covariance de la fenêtre se terminant à chaque ligne
+    """
+    columns, values = _values(data, columns)
+    _check_window(window)
+    return _to_pairwise_frame(_covariance_matrices(values, window, ddof), data, columns)
+
+
+def rolling_correlation_matrix(data, window, columns=None):
+    """
+    Calcule les corrélations glissantes de toutes les paires de colonnes à la fois.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+
+    Retourne :
+    - DataFrame, indexé par (ligne, colonne), la matrice de corrélation de la fenêtre se terminant à chaque ligne
+      (NaN pour les colonnes constantes sur la fenêtre)
+    """
+    columns, values = _values(data, columns)
+    _check_window(window)
+    covariance = _covariance_matrices(values, window, 0)
+    std = np.sqrt(np.maximum(np.diagonal(covariance, axis1=1, axis2=2), 0.0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / (std[:, :, None] * std[:, None, :])
+    correlation[~np.isfinite(correlation)] = np.nan
+    return _to_pairwise_frame(correlation, data, columns)
+
+
+def _monotonic_extremum(values, window, keep):
+    """
+    Extremum glissant d'une colonne avec une file monotone d'indices (chaque indice entre et sort une seule fois).
+
+    keep(a, b) indique si la valeur a doit rester dans la file devant la nouvelle valeur b.
+    """
+    result = np.full(len(values), np.nan)
+    candidates = deque()
+    for i, x in enumerate(values):
+        while candidates and not keep(values[candidates[-1]], x):
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            result[i] = values[candidates[0]]
+    return result
+
+
+def _rolling_extremum(data, window, columns, keep):
+    """
+    Applique `_monotonic_extremum` à chaque colonne sélectionnée.
+    """
+    columns, values = _values(data, columns)
+    _check_window(window)
+    result = np.empty(values.shape)
+    for j in range(values.shape[1]):
+        result[:, j] = _monotonic_extremum(values[:, j].tolist(), window, keep)
+    return _to_frame(result, data, columns)
+
+
+def rolling_min(data, window, columns=None):
+    """
+    Calcule le minimum glissant des colonnes à l'aide de files monotones.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+
+    Retourne :
+    - DataFrame, le minimum de la fenêtre se terminant à chaque ligne
+    """
+    return _rolling_extremum(data, window, columns, lambda a, b: a < b)
+
+
+def rolling_max(data, window, columns=None):
+    """
+    Calcule le maximum glissant des colonnes à l'aide de files monotones.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - window : int, le nombre de lignes de la fenêtre
+    - columns : list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+
+    Retourne :
+    - DataFrame, le maximum de la fenêtre se terminant à chaque ligne
+    """
+    return _rolling_extremum(data, window, columns, lambda a, b: a > b)
+
+
+class RollingStatistics:
+    def __init__(self, window, columns=None, statistics=STATISTICS, ddof=0):
+        """
+        Initialise le calcul de statistiques glissantes sur des données reçues par morceaux.
+
+        Seules les window - 1 dernières lignes du morceau précédent sont conservées : chaque appel à
+        `update` coûte O(window + taille du morceau) et les résultats sont identiques à ceux d'un calcul
+        sur l'ensemble des données.
+
+        Parameters:
+        - window: int, le nombre de lignes de la fenêtre
+        - columns: list of str, les colonnes à traiter, ou None pour toutes les colonnes numériques
+        - statistics: tuple of str, les statistiques à calculer parmi 'mean', 'variance', 'std', 'min', 'max',
+          ainsi que 'covariance' et 'correlation' pour toutes les paires de colonnes
+        - ddof: int, la correction du nombre de degrés de liberté pour la variance, l'écart type et la covariance
+        """
+        unknown = set(statistics) - set(STATISTICS + PAIRWISE_STATISTICS)
+        if unknown:
+            raise ValueError(f"Statistiques inconnues : {sorted(unknown)}. "
+                             f"Valeurs possibles : {STATISTICS + PAIRWISE_STATISTICS}.")
+        _check_window(window)
+        self.window = window
+        self.columns = columns
+        self.statistics = tuple(statistics)
+        self.ddof = ddof
+        self._tail = None
+
+    def update(self, chunk):
+        """
+        Calcule les statistiques glissantes pour les lignes d'un nouveau morceau de données.
+
+        Parameters:
+        - chunk: DataFrame, les lignes suivantes des données
+
+        Returns:
+        - dict, un DataFrame par statistique, indexé comme le morceau (par (ligne, colonne) pour
+          'covariance' et 'correlation')
+        """
+        if self.columns is None:
+            self.columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+        chunk = chunk[self.columns]
+        data = chunk if self._tail is None else pd.concat((self._tail, chunk))
+        n_previous = len(data) - len(chunk)
+
+        functions = {
+            'mean': lambda: rolling_mean(data, self.window),
+            'variance': lambda: rolling_variance(data, self.window, ddof=self.ddof),
+            'std': lambda: rolling_std(data, self.window, ddof=self.ddof),
+            'min': lambda: rolling_min(data, self.window),
+            'max': lambda: rolling_max(data, self.window),
+            'covariance': lambda: rolling_covariance_matrix(data, self.window, ddof=self.ddof),
+            'correlation': lambda: rolling_correlation_matrix(data, self.window),
+        }
+        results = {}
+        for name in self.statistics:
+            # Les statistiques par paire ont une ligne par colonne pour chaque ligne des données
+            rows_per_row = len(self.columns) if name in PAIRWISE_STATISTICS else 1
+            results[name] = functions[name]().iloc[n_previous * rows_per_row:]
+
+        self._tail = data.iloc[len(data) - min(self.window - 1, len(data)):]
+        return results
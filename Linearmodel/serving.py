@@ -0,0 +1,256 @@
+"""
+Module: serving.py
+
+Description:
+Ce module fournit un service local de prédiction asynchrone (asyncio, bibliothèque standard uniquement) autour de
+`OrdinaryLeastSquares.predict`. Les requêtes concurrentes sont regroupées en micro-lots : chaque lot est évalué par un seul
+appel vectorisé à `predict`, exécuté hors de la boucle d'événements pour que de nouvelles requêtes continuent d'être acceptées.
+Le service mesure la latence des requêtes et permet de remplacer le modèle à chaud sans perdre de requêtes : chaque requête
+est évaluée par le modèle avec lequel elle a été validée lors de sa mise en file, les requêtes suivantes utilisent le nouveau.
+
+Utilisation:
+Ce module peut être utilisé en créant un `BatchScoringServer` avec un modèle ajusté, puis en appelant `predict` depuis des
+coroutines, ou en exposant le service sur un port TCP local avec `serve` (protocole JSON, une requête par ligne).
+
+Classe:
+- BatchScoringServer: Service de prédiction par micro-lots.
+
+Fonctions:
+- save_model(model, file_path): Sauvegarde un modèle ajusté dans un fichier.
+- load_model(file_path): Charge un modèle sauvegardé avec `save_model`.
+"""
+
+import asyncio
+import json
+import os
+import pickle
+import time
+from collections import deque
+
+import numpy as np
+
+
+def save_model(model, file_path):
+    """
+    Sauvegarde un modèle ajusté dans un fichier (format pickle).
+
+    Paramètres :
+    - model : OrdinaryLeastSquares, le modèle ajusté
+    - file_path : str, chemin du fichier de sortie
+    """
+    with open(file_path, 'wb') as file:
+        pickle.dump(model, file)
+
+
+def load_model(file_path):
+    """
+    Charge un modèle sauvegardé avec `save_model`.
+
+    Paramètres :
+    - file_path : str, chemin du fichier du modèle
+
+    Retourne :
+    - OrdinaryLeastSquares, le modèle chargé
+    """
+    with open(file_path, 'rb') as file:
+        return pickle.load(file)
+
+
+class BatchScoringServer:
+    def __init__(self, model, max_batch_size=256, max_wait=0.005, latency_window=10000):
+        """
+        Initialise le service de prédiction par micro-lots.
+
+        Parameters:
+        - model: OrdinaryLeastSquares, le modèle ajusté utilisé pour les prédictions
+        - max_batch_size: int, le nombre maximal de lignes par lot
+        - max_wait: float, le délai maximal (en secondes) d'attente de requêtes supplémentaires avant d'évaluer un lot
+        - latency_window: int, le nombre de latences récentes conservées pour les percentiles
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.latencies = deque(maxlen=latency_window)
+        self.n_batches = 0
+        self.n_requests = 0
+        self._queue = None
+        self._worker = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.stop()
+
+    async def start(self):
+        """
+        Démarre la tâche de regroupement des requêtes en lots.
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Arrête le service après avoir évalué les requêtes déjà reçues.
+        """
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def predict(self, features):
+        """
+        Prédit la réponse pour une observation ou un petit lot d'observations.
+
+        Parameters:
+        - features: array-like, une observation (n_features,) ou plusieurs observations (n_rows, n_features)
+
+        Returns:
+        - float or ndarray, la prédiction (ou les prédictions) du modèle
+        """
+        if self._worker is None:
+            raise RuntimeError("Le service doit être démarré avec start() avant d'envoyer des requêtes.")
+        features = np.asarray(features, dtype=float)
+        single = features.ndim == 1
+        rows = features.reshape(1, -1) if single else features
+        # Valider la forme avant la mise en file, pour qu'une requête invalide ne fasse pas échouer tout un lot ;
+        # le modèle utilisé pour la validation est mis en file avec la requête et sert à l'évaluer
+        model = self.model
+        n_features = model.coeffs.shape[0] - int(model.intercept)
+        if rows.ndim != 2 or rows.shape[1] != n_features:
+            raise ValueError(f"Chaque observation doit contenir {n_features} variables explicatives.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future, time.perf_counter(), model))
+        predictions = await future
+        return predictions[0] if single else predictions
+
+    async def swap_model(self, model):
+        """
+        Remplace le modèle utilisé pour les prochaines requêtes, sans interrompre les requêtes déjà en file.
+
+        Un modèle donné par son chemin est chargé hors de la boucle d'événements, qui continue de servir
+        les requêtes pendant la lecture du fichier.
+
+        Parameters:
+        - model: OrdinaryLeastSquares or str, le nouveau modèle ou le chemin d'un modèle sauvegardé avec `save_model`
+        """
+        if isinstance(model, (str, os.PathLike)):
+            model = await asyncio.get_running_loop().run_in_executor(None, load_model, model)
+        self.model = model
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Calcule les percentiles de latence des requêtes récentes.
+
+        Parameters:
+        - percentiles: tuple of float, les percentiles à calculer
+
+        Returns:
+        - dict, la latence (en secondes) pour chaque percentile, vide si aucune requête n'a été servie
+        """
+        if not self.latencies:
+            return {}
+        values = np.percentile(np.fromiter(self.latencies, dtype=float), percentiles)
+        return {f'p{percentile:g}': value for percentile, value in zip(percentiles, values)}
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """
+        Expose le service sur un port TCP local.
+
+        Chaque ligne reçue est un objet JSON {"features": [...]} ; la réponse est une ligne JSON
+        {"prediction": ...} ou {"error": "..."}.
+
+        Parameters:
+        - host: str, l'adresse d'écoute
+        - port: int, le port d'écoute (0 pour un port libre choisi par le système)
+
+        Returns:
+        - asyncio.Server, le serveur démarré
+        """
+        await self.start()
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader, writer):
+        """
+        Traite les requêtes JSON d'une connexion TCP.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    prediction = await self.predict(request['features'])
+                    response = {'prediction': np.asarray(prediction).tolist()}
+                except Exception as error:
+                    response = {'error': str(error)}
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _next_batch(self):
+        """
+        Attend une première requête puis regroupe les suivantes jusqu'à max_batch_size lignes ou max_wait secondes.
+        """
+        batch = [await self._queue.get()]
+        n_rows = batch[0][0].shape[0]
+        deadline = time.perf_counter() + self.max_wait
+        while n_rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            n_rows += item[0].shape[0]
+        return batch
+
+    async def _run(self):
+        """
+        Boucle principale : évalue chaque lot avec un seul appel à predict par modèle et distribue les résultats.
+        """
+        while True:
+            batch = await self._next_batch()
+            # Un lot ne contient plusieurs modèles que si un remplacement a eu lieu pendant son regroupement
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[3]), []).append(item)
+            try:
+                for group in groups.values():
+                    await self._evaluate(group[0][3], group)
+            finally:
+                self.n_batches += 1
+                self.n_requests += len(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _evaluate(self, model, requests):
+        """
+        Évalue des requêtes mises en file avec le même modèle par un seul appel à predict.
+        """
+        try:
+            features = np.vstack([rows for rows, _, _, _ in requests])
+            predictions = await asyncio.get_running_loop().run_in_executor(None, model.predict, features)
+        except Exception as error:
+            for _, future, _, _ in requests:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            offset = 0
+            now = time.perf_counter()
+            for rows, future, started, _ in requests:
+                if not future.done():
+                    future.set_result(predictions[offset:offset + rows.shape[0]])
+                offset += rows.shape[0]
+                self.latencies.append(now - started)
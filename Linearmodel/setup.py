@@ -7,6 +7,7 @@ setup(
     install_requires=[
         'numpy',
         'pandas',
+        'scipy',
         'matplotlib'
     ],
     description='Un package pour effectuer des régressions linéaires et visualiser les résultats',
@@ -19,9 +19,14 @@ Fonctions:
 - calculate_weighted_mode(data, column): Calcule le mode pondéré d'une colonne spécifiée dans les données.
 - summary(data): Réalise une analyse descriptive du DataFrame.
 - find_highly_correlated_variables(data, target, threshold=0.55): Trouve toutes les variables dans le DataFrame qui ont une corrélation supérieure au seuil donné avec la variable cible.
+- covariance_matrix(data, columns=None, block_size=None, n_jobs=1): Calcule la matrice de covariance des colonnes numériques par accumulation de matrices de Gram par blocs.
+- correlation_matrix(data, columns=None, block_size=None, n_jobs=1): Calcule la matrice de corrélation des colonnes numériques par accumulation de matrices de Gram par blocs.
 """
 
 import numpy as np
+import pandas as pd
+
+from .gram import gram_matrix
 
 def calculate_mean(data, column):
     """
@@ -238,3 +243,53 @@ def find_highly_correlated_variables(data, target, threshold=0.55):
     highly_correlated.remove(target)  # Supprimer la variable cible de la liste
     return highly_correlated
 
+
+def covariance_matrix(data, columns=None, block_size=None, n_jobs=1):
+    """
+    Calcule la matrice de covariance des colonnes numériques.
+
+    Les sommes et produits croisés sont accumulés par blocs de lignes, éventuellement en parallèle
+    (voir `gram.gram_matrix`). Comme `calculate_variance`, la covariance est normalisée par n.
+    Les lignes contenant des valeurs manquantes sont ignorées.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - columns : list of str, les colonnes à utiliser, ou None pour toutes les colonnes numériques
+    - block_size : int, nombre de lignes par bloc, ou None pour une taille adaptée au cache
+    - n_jobs : int, nombre de threads, ou None pour utiliser tous les cœurs
+
+    Retourne :
+    - DataFrame, la matrice de covariance indexée par les noms de colonnes
+    """
+    if columns is None:
+        columns = data.select_dtypes(include=[np.number]).columns.tolist()
+    values = data[columns].dropna().to_numpy(dtype=float)
+
+    # Sommes des produits croisés des colonnes recentrées par leurs moyennes : les sommes brutes perdraient
+    # la précision de la covariance par compensation lorsque les moyennes sont grandes devant les écarts
+    shift = values.mean(axis=0) if len(values) else None
+    gram, _ = gram_matrix(values, intercept=True, block_size=block_size, n_jobs=n_jobs, shift=shift)
+    n = gram[0, 0]
+    sums = gram[0, 1:]
+    covariance = (gram[1:, 1:] - np.outer(sums, sums) / n) / n
+    return pd.DataFrame(covariance, index=columns, columns=columns)
+
+
+def correlation_matrix(data, columns=None, block_size=None, n_jobs=1):
+    """
+    Calcule la matrice de corrélation des colonnes numériques.
+
+    Paramètres :
+    - data : DataFrame, les données
+    - columns : list of str, les colonnes à utiliser, ou None pour toutes les colonnes numériques
+    - block_size : int, nombre de lignes par bloc, ou None pour une taille adaptée au cache
+    - n_jobs : int, nombre de threads, ou None pour utiliser tous les cœurs
+
+    Retourne :
+    - DataFrame, la matrice de corrélation indexée par les noms de colonnes
+    """
+    covariance = covariance_matrix(data, columns, block_size=block_size, n_jobs=n_jobs)
+    std = np.sqrt(np.diag(covariance.to_numpy()))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance.to_numpy() / np.outer(std, std)
+    return pd.DataFrame(correlation, index=covariance.index, columns=covariance.columns)
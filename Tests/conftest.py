@@ -0,0 +1,32 @@
+"""
+Données de test partagées : un extrait synthétique au format des données eCO2mix (pas de 15 minutes).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def energy_data():
+    rng = np.random.default_rng(0)
+    n = 200
+    consumption = rng.normal(60000, 5000, n)
+    consumption[::7] = 0  # Quarts d'heure sans consommation réalisée
+    gaz = rng.normal(size=n)
+    fioul = rng.normal(size=n)
+    charbon = rng.normal(size=n) + 0.5 * gaz
+    noise = rng.normal(scale=1 + np.abs(gaz), size=n)  # Bruit hétéroscédastique
+    return pd.DataFrame({
+        'Datetime': pd.date_range('2020-01-01', periods=n, freq='15min'),
+        'Consommation': consumption,
+        'Prévision J': consumption + rng.normal(100, 800, n),
+        'Prévision J-1': consumption + rng.normal(-200, 1500, n),
+        'Gaz': gaz,
+        'Fioul': fioul,
+        'Charbon': charbon,
+        'Taux de Co2': gaz - 2 * fioul + 0.5 * charbon + 4 + noise,
+    })
+
+@pytest.fixture
+def regression_data(energy_data):
+    return energy_data[['Gaz', 'Fioul', 'Charbon']].to_numpy(), energy_data['Taux de Co2'].to_numpy()
@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from Linearmodel.encoding import encode_categorical
+
+def test_encode_categorical():
+    data = pd.DataFrame({'col1': ['a', 'b', 'a', 'c'], 'col2': ['x', 'x', 'y', None]})
+    matrix, names = encode_categorical(data, ['col1', 'col2'])
+    assert sparse.issparse(matrix)
+    assert names == ['col1=b', 'col1=c', 'col2=y']
+    assert np.array_equal(matrix.toarray(), [[0, 0, 0], [1, 0, 0], [0, 0, 1], [0, 1, 0]])
+
+def test_encode_categorical_keep_first():
+    data = pd.DataFrame({'col1': ['a', 'b', 'a']})
+    matrix, names = encode_categorical(data, ['col1'], drop_first=False)
+    assert names == ['col1=a', 'col1=b']
+    assert np.array_equal(matrix.toarray(), [[1, 0], [0, 1], [1, 0]])
+
+def test_encode_categorical_missing_column():
+    data = pd.DataFrame({'col1': ['a', 'b']})
+    with pytest.raises(ValueError):
+        encode_categorical(data, ['col2'])
+
+def test_encode_carbon_data():
+    data = pd.read_csv('basecarbone_sample.csv', sep=';')
+    matrix, names = encode_categorical(data, ['Nom base français', 'Unité français'])
+    assert matrix.shape == (len(data), len(names))
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+import numpy as np
+import pandas as pd
+from Linearmodel.features import LaggedDesign
+from Linearmodel.gram import gram_matrix
+from Linearmodel.regression import OrdinaryLeastSquares
+
+def _shifted(data, columns, max_lag, min_lag=1):
+    lagged = pd.concat([data[column].shift(lag) for column in columns for lag in range(min_lag, max_lag + 1)], axis=1)
+    return lagged.to_numpy()[max_lag:]
+
+def test_lagged_design_values(energy_data):
+    data = energy_data
+    design = LaggedDesign(data, ['Gaz', 'Fioul'], max_lag=4)
+    assert design.shape == (196, 8)
+    assert design.feature_names[:2] == ['Gaz(t-1)', 'Gaz(t-2)']
+    assert np.array_equal(design.to_array(), _shifted(data, ['Gaz', 'Fioul'], 4))
+    assert np.shares_memory(design._view, design.values)
+
+    with_current = LaggedDesign(data, ['Gaz'], max_lag=2, min_lag=0)
+    assert np.array_equal(with_current[:3], _shifted(data, ['Gaz'], 2, 0)[:3])
+
+def test_lagged_design_gram_and_fit(energy_data):
+    data = energy_data
+    design = LaggedDesign(data, ['Gaz', 'Fioul'], max_lag=5, block_size=7)
+    dense = design.to_array()
+    y = design.align(data['Gaz'] + 0.5 * data['Fioul'].shift(1).fillna(0))
+    gram, Xty = gram_matrix(design, y, block_size=7)
+    assert np.allclose(gram, dense.T @ dense)
+    assert np.allclose(Xty, dense.T @ y)
+
+    model = OrdinaryLeastSquares(intercept=True, block_size=7)
+    model.fit(design, y)
+    reference = OrdinaryLeastSquares(intercept=True)
+    reference.fit(dense, y)
+    assert np.allclose(model.get_coeffs(), reference.get_coeffs())
+    assert np.allclose(model.predict(design), reference.predict(dense))
+    assert np.allclose(model.get_results().standard_errors('HC1'), reference.get_results().standard_errors('HC1'))
+
+def test_lagged_design_unaligned_target(energy_data):
+    data = energy_data
+    design = LaggedDesign(data, ['Gaz'], max_lag=4)
+    # y non aligné (sans align()) : il a max_lag lignes de trop et l'ajustement est refusé
+    with pytest.raises(ValueError):
+        OrdinaryLeastSquares().fit(design, data['Gaz'])
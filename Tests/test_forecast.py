@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+import numpy as np
+import pandas as pd
+from Linearmodel.forecast import ForecastAccuracy, evaluate_forecasts
+
+def test_evaluate_forecasts(energy_data):
+    data = energy_data
+    metrics = evaluate_forecasts(data, by='hour')
+    assert metrics.shape[0] == 48
+
+    valid = data[data['Consommation'] != 0]
+    error = valid['Prévision J'] - valid['Consommation']
+    grouped = error.groupby(valid['Datetime'].dt.hour)
+    result = metrics.loc['Prévision J']
+    assert np.allclose(result['Count'], grouped.size())
+    assert np.allclose(result['MAE'], grouped.apply(lambda e: e.abs().mean()))
+    assert np.allclose(result['RMSE'], grouped.apply(lambda e: np.sqrt((e ** 2).mean())))
+    assert np.allclose(result['Bias'], grouped.mean())
+    mape = (error.abs() / valid['Consommation']).groupby(valid['Datetime'].dt.hour).mean() * 100
+    assert np.allclose(result['MAPE'], mape)
+    assert np.allclose(result['Q50'], grouped.quantile(0.5, interpolation='lower'), atol=10)
+
+def test_forecast_accuracy_incremental(energy_data):
+    data = energy_data
+    incremental = ForecastAccuracy()
+    for start in range(0, len(data), 30):
+        incremental.update(data.iloc[start:start + 30])
+    merged = ForecastAccuracy().update(data.iloc[:100]).merge(ForecastAccuracy().update(data.iloc[100:]))
+    expected = evaluate_forecasts(data, by='weekday')
+    assert np.allclose(incremental.metrics('weekday'), expected, equal_nan=True)
+    assert np.allclose(merged.metrics('weekday'), expected, equal_nan=True)
+
+    months = incremental.metrics('month')
+    assert months.loc[('Prévision J', 0), 'Count'] > 0
+    assert np.isnan(months.loc[('Prévision J', 5), 'MAE'])
+    with pytest.raises(ValueError):
+        incremental.metrics('year')
+    with pytest.raises(ValueError):
+        incremental.merge(ForecastAccuracy(forecasts=('Prévision J',)))
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+import numpy as np
+from scipy import sparse
+from Linearmodel.gram import column_means, gram_matrix, row_blocks
+
+def test_row_blocks():
+    assert row_blocks(10, 4) == [(0, 4), (4, 8), (8, 10)]
+
+def test_gram_matrix_blocked_threads():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1000, 4))
+    y = rng.normal(size=(1000, 2))
+    weights = rng.random(1000)
+    design = np.hstack((np.ones((1000, 1)), X))
+    gram, Xty = gram_matrix(X, y, sample_weight=weights, intercept=True, block_size=64, n_jobs=3)
+    assert np.allclose(gram, design.T @ (weights[:, None] * design))
+    assert np.allclose(Xty, design.T @ (weights[:, None] * y))
+
+def test_gram_matrix_sparse():
+    rng = np.random.default_rng(1)
+    X = sparse.random(500, 6, density=0.2, format='csr', random_state=1)
+    y = rng.normal(size=500)
+    gram, Xty = gram_matrix(X, y, block_size=100, n_jobs=2)
+    assert np.allclose(gram, (X.T @ X).toarray())
+    assert np.allclose(Xty, X.T @ y)
+    assert gram_matrix(X)[1] is None
+
+def test_gram_matrix_shift():
+    X_dense = np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 0.0], [0.0, 0.0], [1.0, 1.0]])
+    y = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    weights = np.array([1.0, 2.0, 1.0, 0.5, 1.0])
+    shift = column_means(X_dense, weights)
+    assert np.allclose(shift, np.average(X_dense, axis=0, weights=weights))
+    design = np.hstack((np.ones((5, 1)), X_dense - shift))
+    for X in (X_dense, sparse.csr_matrix(X_dense)):
+        gram, Xty = gram_matrix(X, y, sample_weight=weights, intercept=True, shift=shift, n_jobs=2)
+        assert np.allclose(gram, design.T @ (weights[:, None] * design))
+        assert np.allclose(Xty, design.T @ (weights * y))
@@ -2,11 +2,53 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
+import shutil
+
 import pytest
 import pandas as pd
-from Linearmodel.loading import load_data
+from Linearmodel.loading import load_data, DataIndex
 
 def test_load_data():
     df = load_data('eCO2mix_RTE_Annuel-Definitif_2020.csv')
     assert not df.empty
     assert 'Datetime' in df.columns
+
+def test_load_data_pushdown(tmpdir):
+    # Copie du fichier : les zones sont enregistrées à côté du fichier CSV
+    file_path = str(tmpdir.join('eCO2mix.csv'))
+    shutil.copy('eCO2mix_RTE_Annuel-Definitif_2020.csv', file_path)
+    df = load_data(file_path, start='2020-02-01', end='2020-03-01', filters=[('Charbon', '>', 0)], chunksize=1000)
+    assert os.path.exists(file_path + '.zones.json')
+    full = load_data(file_path)
+    expected = full[(full['Datetime'] >= '2020-02-01') & (full['Datetime'] < '2020-03-01') & (full['Charbon'] > 0)]
+    assert len(df) == len(expected) > 0
+    assert df.equals(expected.reset_index(drop=True))
+
+    # Les zones sont réutilisées, et les types sont ceux de la lecture complète
+    december = load_data(file_path, start='2020-12-01', chunksize=1000)
+    assert december.equals(full[full['Datetime'] >= '2020-12-01'].reset_index(drop=True))
+    assert load_data(file_path, filters=[('Charbon', '>', 1e9)], chunksize=1000).dtypes.equals(full.dtypes)
+
+    # Un fichier modifié reconstruit les zones
+    with open(file_path, 'a') as file:
+        file.write('\n2021-01-01;00:00;70000;70000;70000;1;2;3;4;5;6;7;8;9;10;11\n')
+    assert len(load_data(file_path, start='2021-01-01', chunksize=1000)) == 1
+    with pytest.raises(ValueError):
+        load_data(file_path, filters=[('Charbon', '~', 0)])
+
+def test_data_index():
+    data = pd.DataFrame({
+        'Datetime': pd.date_range('2020-01-01', periods=100, freq='h')[::-1],
+        'Charbon': [0] * 50 + list(range(50)),
+    })
+    index = DataIndex(data, block_size=8)
+    assert index.data['Datetime'].is_monotonic_increasing
+    january_2 = index.range('2020-01-02', '2020-01-03')
+    assert len(january_2) == 24
+    assert january_2['Datetime'].min() == pd.Timestamp('2020-01-02')
+
+    evenings = index.query(start='2020-01-02', filters=[('Charbon', '>', 0)], hours=(18, 23))
+    expected = index.data[(index.data['Datetime'] >= '2020-01-02') & (index.data['Charbon'] > 0)
+                          & (index.data['Datetime'].dt.hour >= 18)]
+    assert evenings.equals(expected)
+    assert index.query(filters=[('Charbon', '>', 100)]).empty
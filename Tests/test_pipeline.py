@@ -0,0 +1,151 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import importlib
+import pickle
+import shutil
+import subprocess
+from collections import OrderedDict
+
+import pytest
+from Linearmodel.pipeline import Pipeline
+
+def _read(file_path):
+    with open(file_path) as file:
+        return file.read()
+
+def _count_words(text):
+    return len(text.split())
+
+def _write_report(count, file_name, prefix):
+    with open(file_name, 'w') as file:
+        file.write(f'{prefix}{count}')
+    return count
+
+def _build(tmpdir, prefix='n='):
+    input_path = str(tmpdir.join('input.txt'))
+    report_path = str(tmpdir.join('report.txt'))
+    pipeline = Pipeline(cache_dir=str(tmpdir.join('cache')))
+    pipeline.add_stage('text', _read, params={'file_path': input_path}, files=[input_path])
+    pipeline.add_stage('count', _count_words, inputs=['text'])
+    pipeline.add_stage('report', _write_report, inputs=['count'],
+                       params={'file_name': report_path, 'prefix': prefix}, outputs=[report_path])
+    return pipeline, input_path, report_path
+
+def test_pipeline_cache(tmpdir):
+    pipeline, input_path, report_path = _build(tmpdir)
+    with open(input_path, 'w') as file:
+        file.write('a b c')
+    assert pipeline.run()['count'] == 3
+    assert pipeline.computed == ['text', 'count', 'report']
+
+    pipeline.run()
+    assert pipeline.computed == []
+
+    # Seule l'étape dont un paramètre a changé est recalculée
+    pipeline, _, _ = _build(tmpdir, prefix='mots=')
+    pipeline.run(['report'])
+    assert pipeline.computed == ['report']
+    assert _read(report_path) == 'mots=3'
+
+    # Un changement du fichier d'entrée recalcule tout l'aval
+    with open(input_path, 'w') as file:
+        file.write('a b c d')
+    assert pipeline.run()['count'] == 4
+    assert pipeline.computed == ['text', 'count', 'report']
+
+def test_pipeline_restores_outputs(tmpdir):
+    pipeline, input_path, report_path = _build(tmpdir)
+    with open(input_path, 'w') as file:
+        file.write('a b')
+    pipeline.run()
+    os.remove(report_path)
+    pipeline.run()
+    assert pipeline.computed == []
+    assert _read(report_path) == 'n=2'
+
+def test_pipeline_eviction(tmpdir):
+    pipeline, input_path, _ = _build(tmpdir)
+    pipeline.max_bytes = 1
+    with open(input_path, 'w') as file:
+        file.write('a b')
+    pipeline.run()
+    assert len(os.listdir(str(tmpdir.join('cache')))) == 1
+
+def test_pipeline_unknown_input(tmpdir):
+    pipeline = Pipeline(cache_dir=str(tmpdir.join('cache')))
+    with pytest.raises(ValueError):
+        pipeline.add_stage('count', _count_words, inputs=['text'])
+
+def test_pipeline_tracks_local_modules(tmpdir, monkeypatch):
+    tmpdir.join('pipeline_helper.py').write('def double(x):\n    return 2 * x\n')
+    tmpdir.join('pipeline_stage.py').write('from pipeline_helper import double\n\ndef compute():\n    return double(3)\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    stage_module = importlib.import_module('pipeline_stage')
+
+    def build():
+        pipeline = Pipeline(cache_dir=str(tmpdir.join('cache')))
+        pipeline.add_stage('value', stage_module.compute)
+        return pipeline
+
+    assert build().run()['value'] == 6
+    pipeline = build()
+    pipeline.run()
+    assert pipeline.computed == []
+
+    # Une modification d'un module dont dépend la fonction de l'étape invalide son cache
+    tmpdir.join('pipeline_helper.py').write('def double(x):\n    return x + x\n')
+    pipeline = build()
+    pipeline.run()
+    assert pipeline.computed == ['value']
+
+    # Une fonction du même module que la fonction de l'étape mais qu'elle n'utilise pas n'en fait pas partie
+    tmpdir.join('pipeline_helper.py').write('def double(x):\n    return x + x\n\ndef triple(x):\n    return 3 * x\n')
+    pipeline = build()
+    pipeline.run()
+    assert pipeline.computed == []
+    for name in ('pipeline_helper', 'pipeline_stage'):
+        monkeypatch.delitem(sys.modules, name)
+
+def test_pipeline_main_plotting_change(tmpdir):
+    # Copie du script d'analyse pour pouvoir modifier le module de visualisation
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+    shutil.copytree(os.path.join(root, 'Linearmodel'), str(tmpdir.join('Linearmodel')),
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    for name in ('main.py', 'eCO2mix_RTE_Annuel-Definitif_2020.csv'):
+        shutil.copy(os.path.join(root, name), str(tmpdir))
+    script = ("import main\n"
+              "pipeline = main.build_pipeline(cache_dir='cache')\n"
+              "pipeline.run(['model', 'basic_statistics'])\n"
+              "print(pipeline.computed, pipeline.stage_key('model'), pipeline.stage_key('scatter'))\n")
+
+    def run():
+        output = subprocess.run([sys.executable, '-c', script], cwd=str(tmpdir), check=True,
+                                capture_output=True, text=True).stdout
+        return output.strip().rsplit(' ', 2)
+
+    computed, model_key, scatter_key = run()
+    assert 'model' in computed and 'basic_statistics' in computed
+
+    # Une modification des graphiques n'invalide ni le modèle ni les statistiques
+    visualization = tmpdir.join('Linearmodel', 'visualization.py')
+    visualization.write(visualization.read().replace('dpi=300', 'dpi=150'))
+    computed, new_model_key, new_scatter_key = run()
+    assert computed == '[]'
+    assert new_model_key == model_key
+    assert new_scatter_key != scatter_key
+
+def test_pipeline_unreadable_entry(tmpdir):
+    pipeline, input_path, _ = _build(tmpdir)
+    with open(input_path, 'w') as file:
+        file.write('a b')
+    pipeline.run()
+    # Entrées sérialisées avec une classe ou un module qui n'existent plus : les étapes sont recalculées
+    entry = pickle.dumps({'result': OrderedDict(), 'files': {}})
+    with open(pipeline._entry_path(pipeline.stage_key('count')), 'wb') as file:
+        file.write(entry.replace(b'OrderedDict', b'RemovedDict'))
+    with open(pipeline._entry_path(pipeline.stage_key('text')), 'wb') as file:
+        file.write(entry.replace(b'collections', b'removed_mod'))
+    assert pipeline.run()['count'] == 2
+    assert pipeline.computed == ['text', 'count']
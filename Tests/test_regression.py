@@ -2,9 +2,13 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
+import pickle
+
 import pytest
 import numpy as np
-from Linearmodel.regression import OrdinaryLeastSquares
+import pandas as pd
+from scipy import sparse
+from Linearmodel.regression import OrdinaryLeastSquares, RollingOLS
 
 def test_ols_fit():
     X = np.array([[1, 1], [1, 2], [2, 2], [2, 3]])
@@ -24,6 +28,7 @@ def test_ols_predict():
     y_pred = model.predict(X_test)
     assert len(y_pred) == 2
     assert np.allclose(y_pred, [16, 8])
+    assert isinstance(model.predict(pd.DataFrame(X_test)), np.ndarray)
 
 def test_determination_coefficient():
     X = np.array([[1, 1], [1, 2], [2, 2], [2, 3]])
@@ -32,3 +37,177 @@ def test_determination_coefficient():
     model.fit(X, y)
     r_squared = model.determination_coefficient(X, y)
     assert r_squared == 1.0
+
+def test_results_standard_errors(regression_data):
+    X, y = regression_data
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y)
+    results = model.get_results()
+    design = np.hstack((np.ones((200, 1)), X))
+    residuals = y - design @ model.get_coeffs()
+    sigma2 = residuals @ residuals / (200 - 4)
+    inv_gram = np.linalg.inv(design.T @ design)
+    assert np.isclose(results.residual_variance(), sigma2)
+    assert np.allclose(results.standard_errors(), np.sqrt(np.diag(sigma2 * inv_gram)))
+    assert np.isclose(results.r_squared, model.determination_coefficient(X, y))
+
+def test_results_robust_standard_errors(regression_data):
+    X, y = regression_data
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y)
+    results = model.get_results()
+    design = np.hstack((np.ones((200, 1)), X))
+    residuals = y - design @ model.get_coeffs()
+    inv_gram = np.linalg.inv(design.T @ design)
+    leverage = np.diag(design @ inv_gram @ design.T)
+    hc0 = inv_gram @ design.T @ np.diag(residuals ** 2) @ design @ inv_gram
+    hc3 = inv_gram @ design.T @ np.diag(residuals ** 2 / (1 - leverage) ** 2) @ design @ inv_gram
+    assert np.allclose(results.cov_params('HC0'), hc0)
+    assert np.allclose(results.cov_params('HC3'), hc3)
+    with pytest.raises(ValueError):
+        results.cov_params('HC9')
+
+def test_results_tests_and_vif(regression_data):
+    X, y = regression_data
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y)
+    results = model.get_results()
+    p_values = results.p_values()
+    assert p_values.shape == (4,)
+    assert np.all((p_values >= 0) & (p_values <= 1))
+    f_value, f_pvalue = results.f_statistic()
+    r2 = results.r_squared
+    assert np.isclose(f_value, (r2 / 3) / ((1 - r2) / (200 - 4)))
+    assert f_pvalue < 1e-6
+    assert results.adjusted_r_squared() < r2
+
+    # VIF de la troisième variable : 1 / (1 - R^2) de sa régression sur les autres
+    auxiliary = OrdinaryLeastSquares(intercept=True)
+    auxiliary.fit(X[:, :2], X[:, 2])
+    expected = 1 / (1 - auxiliary.determination_coefficient(X[:, :2], X[:, 2]))
+    assert np.isclose(results.vif()[2], expected)
+
+def test_results_large_means(regression_data):
+    X, y = regression_data
+    reference = OrdinaryLeastSquares(intercept=True)
+    reference.fit(X, y)
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X + 1e8, y + 1e7)
+    results = model.get_results()
+    assert np.allclose(model.get_coeffs()[1:], reference.get_coeffs()[1:])
+    assert np.isclose(results.r_squared, reference.get_results().r_squared)
+    assert np.isclose(results.residual_variance(), reference.get_results().residual_variance())
+    assert np.allclose(results.vif(), reference.get_results().vif())
+    assert np.allclose(results.standard_errors('HC3')[1:], reference.get_results().standard_errors('HC3')[1:])
+
+def test_results_after_pickle(regression_data):
+    X, y = regression_data
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y)
+    restored = pickle.loads(pickle.dumps(model))
+    assert not hasattr(restored, '_X')
+    assert np.allclose(restored.predict(X), model.predict(X))
+    assert np.allclose(restored.get_results().standard_errors(), model.get_results().standard_errors())
+    with pytest.raises(ValueError):
+        restored.get_results().standard_errors('HC0')
+
+def test_ols_multi_target(regression_data):
+    X, y = regression_data
+    Y = np.column_stack((y, 2 * y - X[:, 1], X[:, 0] + 1))
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, Y)
+    coeffs = model.get_coeffs()
+    assert coeffs.shape == (4, 3)
+    assert model.predict(X).shape == (200, 3)
+
+    r_squared = model.determination_coefficient(X, Y)
+    results = model.get_results()
+    for k in range(3):
+        single = OrdinaryLeastSquares(intercept=True)
+        single.fit(X, Y[:, k])
+        assert np.allclose(coeffs[:, k], single.get_coeffs())
+        assert np.isclose(r_squared[k], single.determination_coefficient(X, Y[:, k]))
+        single_results = single.get_results()
+        assert np.allclose(results.standard_errors()[:, k], single_results.standard_errors())
+        assert np.allclose(results.standard_errors('HC1')[:, k], single_results.standard_errors('HC1'))
+
+def test_ols_weighted(regression_data):
+    X, y = regression_data
+    weights = np.linspace(0.5, 2.0, 200)
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y, sample_weight=weights)
+    design = np.hstack((np.ones((200, 1)), X))
+    sqrt_w = np.sqrt(weights)
+    expected = np.linalg.lstsq(design * sqrt_w[:, None], y * sqrt_w, rcond=None)[0]
+    assert np.allclose(model.get_coeffs(), expected)
+
+    # Les statistiques pondérées correspondent à celles de l'OLS sur les données blanchies
+    whitened = OrdinaryLeastSquares(intercept=False)
+    whitened.fit(design * sqrt_w[:, None], y * sqrt_w)
+    assert np.allclose(model.get_results().standard_errors(), whitened.get_results().standard_errors())
+    assert np.allclose(model.get_results().standard_errors('HC2'), whitened.get_results().standard_errors('HC2'))
+
+def test_ols_sparse_and_iterative_solvers():
+    rng = np.random.default_rng(1)
+    X_dense = (rng.random((300, 20)) < 0.1).astype(float)
+    y = X_dense @ rng.normal(size=20) + 1 + rng.normal(scale=0.1, size=300)
+    X_sparse = sparse.csr_matrix(X_dense)
+
+    dense_model = OrdinaryLeastSquares(intercept=True)
+    dense_model.fit(X_dense, y)
+    for solver in ('cholesky', 'lsqr', 'cg'):
+        model = OrdinaryLeastSquares(intercept=True, solver=solver)
+        model.fit(X_sparse, y)
+        assert np.allclose(model.get_coeffs(), dense_model.get_coeffs(), atol=1e-6)
+        assert np.allclose(model.predict(X_sparse), dense_model.predict(X_dense), atol=1e-6)
+        if solver == 'cholesky':
+            assert np.allclose(model.get_results().leverage(), dense_model.get_results().leverage())
+            assert np.allclose(model.get_results().standard_errors('HC3'),
+                               dense_model.get_results().standard_errors('HC3'))
+
+    with pytest.raises(ValueError):
+        model.get_results()
+    with pytest.raises(ValueError):
+        OrdinaryLeastSquares(solver='qr')
+
+def test_ols_blocked_parallel_fit(regression_data):
+    X, y = regression_data
+    reference = OrdinaryLeastSquares(intercept=True)
+    reference.fit(X, y)
+    model = OrdinaryLeastSquares(intercept=True, n_jobs=4, block_size=16)
+    model.fit(X, y)
+    assert np.allclose(model.get_coeffs(), reference.get_coeffs())
+    assert np.allclose(model.get_results().standard_errors('HC3'), reference.get_results().standard_errors('HC3'))
+
+def test_ols_length_mismatch(regression_data):
+    X, y = regression_data
+    X, y = X[:100], y[:105]
+    # Un y plus long ou plus court que X est refusé, quel que soit le type de X
+    for design in (X, sparse.csr_matrix(X)):
+        with pytest.raises(ValueError):
+            OrdinaryLeastSquares().fit(design, y)
+        with pytest.raises(ValueError):
+            OrdinaryLeastSquares().fit(design, y[:95])
+
+def test_rolling_ols(regression_data):
+    X, y = regression_data
+    model = RollingOLS(window=50, step=3, refresh=10)
+    model.fit(X, y)
+    assert model.rolling_coeffs.shape == (51, 4)
+    assert model.rolling_r_squared.shape == (51,)
+    for k in (0, 7, 25, 50):
+        start = 3 * k
+        reference = OrdinaryLeastSquares(intercept=True)
+        reference.fit(X[start:start + 50], y[start:start + 50])
+        assert np.allclose(model.rolling_coeffs[k], reference.get_coeffs())
+        r_squared = reference.determination_coefficient(X[start:start + 50], y[start:start + 50])
+        assert np.isclose(model.rolling_r_squared[k], r_squared)
+    assert np.allclose(model.get_coeffs(), model.rolling_coeffs[-1])
+
+def test_rolling_ols_singular_window():
+    X = np.column_stack((np.arange(20.0), np.r_[np.zeros(10), np.arange(10.0) ** 2]))
+    y = X @ np.array([1.0, 2.0]) + 1
+    model = RollingOLS(window=5)
+    model.fit(X, y)
+    assert np.all(np.isnan(model.rolling_coeffs[0]))
+    assert np.allclose(model.rolling_coeffs[-1], [1, 1, 2])
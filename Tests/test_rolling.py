@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+import numpy as np
+import pandas as pd
+from Linearmodel.rolling import window_length, rolling_mean, rolling_variance, rolling_std, rolling_covariance, rolling_correlation, rolling_covariance_matrix, rolling_correlation_matrix, rolling_min, rolling_max, RollingStatistics
+
+def test_window_length():
+    assert window_length('1h') == 4
+    assert window_length('7D') == 672
+    with pytest.raises(ValueError):
+        window_length('10min')
+
+def test_rolling_mean_variance(energy_data):
+    data = energy_data[['Datetime', 'Consommation', 'Gaz']]
+    expected = data[['Consommation', 'Gaz']].rolling(24)
+    assert list(rolling_mean(data, 24).columns) == ['Consommation', 'Gaz']
+    assert np.allclose(rolling_mean(data, 24), expected.mean(), equal_nan=True)
+    assert np.allclose(rolling_variance(data, 24), expected.var(ddof=0), equal_nan=True)
+    assert np.allclose(rolling_variance(data, 24, method='welford'), expected.var(ddof=0), equal_nan=True)
+    assert np.allclose(rolling_std(data, 24, ddof=1), expected.std(), equal_nan=True)
+
+def test_rolling_covariance_correlation(energy_data):
+    data = energy_data[['Datetime', 'Consommation', 'Gaz']]
+    expected = data['Consommation'].rolling(24)
+    assert np.allclose(rolling_covariance(data, 24, 'Consommation', 'Gaz', ddof=1), expected.cov(data['Gaz']), equal_nan=True)
+    assert np.allclose(rolling_correlation(data, 24, 'Consommation', 'Gaz'), expected.corr(data['Gaz']), equal_nan=True)
+
+def test_rolling_covariance_correlation_matrix(energy_data):
+    data = energy_data[['Datetime', 'Consommation', 'Gaz']]
+    expected = data[['Consommation', 'Gaz']].rolling(24)
+    covariance = rolling_covariance_matrix(data, 24, ddof=1)
+    assert covariance.index.equals(expected.cov().index)
+    assert np.allclose(covariance, expected.cov(), equal_nan=True)
+    assert np.allclose(rolling_correlation_matrix(data, 24), expected.corr(), equal_nan=True)
+
+def test_rolling_min_max(energy_data):
+    data = energy_data[['Datetime', 'Consommation', 'Gaz']]
+    expected = data[['Consommation', 'Gaz']].rolling(10)
+    assert np.allclose(rolling_min(data, 10), expected.min(), equal_nan=True)
+    assert np.allclose(rolling_max(data, 10), expected.max(), equal_nan=True)
+
+def test_rolling_statistics_chunks(energy_data):
+    data = energy_data[['Datetime', 'Consommation', 'Gaz']]
+    rolling = RollingStatistics(24, columns=['Consommation', 'Gaz'], statistics=('mean', 'min', 'variance', 'correlation'))
+    chunks = [rolling.update(data.iloc[start:start + 70]) for start in range(0, 200, 70)]
+    for name, function in (('mean', rolling_mean), ('min', rolling_min), ('variance', rolling_variance),
+                           ('correlation', rolling_correlation_matrix)):
+        combined = pd.concat([chunk[name] for chunk in chunks])
+        assert np.allclose(combined, function(data, 24, ['Consommation', 'Gaz']), equal_nan=True)
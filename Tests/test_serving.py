@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import asyncio
+import json
+import pytest
+import numpy as np
+from Linearmodel.regression import OrdinaryLeastSquares
+from Linearmodel.serving import BatchScoringServer, save_model
+
+def _fit_model(slope):
+    X = np.array([[1.0], [2.0], [3.0], [4.0]])
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, slope * X[:, 0] + 1)
+    return model
+
+def test_batch_predictions():
+    model = _fit_model(2.0)
+    rows = np.arange(50, dtype=float).reshape(-1, 1)
+
+    async def run():
+        async with BatchScoringServer(model, max_batch_size=16, max_wait=0.05) as server:
+            predictions = await asyncio.gather(*(server.predict(row) for row in rows))
+            return server, predictions
+
+    server, predictions = asyncio.run(run())
+    assert np.allclose(predictions, model.predict(rows))
+    assert server.n_requests == 50
+    assert server.n_batches < 50
+    assert set(server.latency_percentiles()) == {'p50', 'p90', 'p99'}
+
+def test_swap_model(tmpdir):
+    file_path = str(tmpdir.join('model.pkl'))
+    save_model(_fit_model(3.0), file_path)
+
+    async def run():
+        async with BatchScoringServer(_fit_model(2.0), max_wait=0.001) as server:
+            before = await server.predict([1.0])
+            await server.swap_model(file_path)
+            after = await server.predict([1.0])
+            return before, after
+
+    before, after = asyncio.run(run())
+    assert before == pytest.approx(3.0)
+    assert after == pytest.approx(4.0)
+
+def test_swap_model_with_queued_requests():
+    wide = OrdinaryLeastSquares(intercept=True)
+    wide.fit(np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [2.0, 1.0]]), np.array([1.0, 2.0, 3.0, 4.0]))
+
+    async def run():
+        async with BatchScoringServer(_fit_model(2.0), max_wait=0.05) as server:
+            queued = [asyncio.ensure_future(server.predict([float(k)])) for k in range(5)]
+            await asyncio.sleep(0)
+            await server.swap_model(wide)
+            return await asyncio.gather(*queued), await server.predict([1.0, 1.0])
+
+    queued, after = asyncio.run(run())
+    assert np.allclose(queued, [1.0, 3.0, 5.0, 7.0, 9.0])
+    assert after == pytest.approx(3.0)
+
+def test_tcp_server():
+    async def run():
+        scorer = BatchScoringServer(_fit_model(2.0), max_wait=0.001)
+        server = await scorer.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"features": [[1.0], [2.0]]}\n{"features": [1.0, 2.0]}\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await scorer.stop()
+        return responses
+
+    responses = asyncio.run(run())
+    assert np.allclose(responses[0]['prediction'], [3.0, 5.0])
+    assert 'error' in responses[1]
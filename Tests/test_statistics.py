@@ -4,7 +4,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../'
 
 import pytest
 import pandas as pd
-from Linearmodel.statistics import calculate_mean, calculate_std, calculate_correlation, calculate_median, calculate_variance, calculate_mode, calculate_weighted_mode, summary, find_highly_correlated_variables
+from Linearmodel.statistics import calculate_mean, calculate_std, calculate_correlation, calculate_median, calculate_variance, calculate_mode, calculate_weighted_mode, summary, find_highly_correlated_variables, covariance_matrix, correlation_matrix
 
 def test_calculate_mean():
     data = pd.DataFrame({'col1': [1, 2, 3, 4, 5]})
@@ -52,3 +52,18 @@ def test_find_highly_correlated_variables():
     highly_correlated = find_highly_correlated_variables(data, 'target', threshold=0.9)
     assert 'col1' in highly_correlated
     assert 'col2' in highly_correlated  
+
+def test_covariance_and_correlation_matrix():
+    data = pd.DataFrame({'col1': [1.0, 2.0, 3.0, 4.0, 5.0], 'col2': [5.0, 3.0, 4.0, 1.0, 2.0], 'name': list('abcde')})
+    covariance = covariance_matrix(data, block_size=2, n_jobs=2)
+    assert list(covariance.columns) == ['col1', 'col2']
+    assert covariance.loc['col1', 'col1'] == pytest.approx(calculate_variance(data, 'col1'))
+    correlation = correlation_matrix(data, block_size=2, n_jobs=2)
+    assert correlation.loc['col1', 'col2'] == pytest.approx(calculate_correlation(data, 'col1', 'col2')['Correlation'])
+    assert correlation.loc['col2', 'col2'] == pytest.approx(1.0)
+
+def test_covariance_matrix_large_mean():
+    data = pd.DataFrame({'col1': [1e8 + 1, 1e8 - 1, 1e8 + 2, 1e8 - 2], 'col2': [1.0, -1.0, 2.0, -2.0]})
+    covariance = covariance_matrix(data, block_size=3)
+    assert covariance.loc['col1', 'col1'] == pytest.approx(2.5)
+    assert correlation_matrix(data).loc['col1', 'col2'] == pytest.approx(1.0)
@@ -2,17 +2,22 @@
 Module: main.py
 
 Description:
-Ce module exécute une série d'analyses statistiques et de visualisations sur un jeu de données en utilisant les fonctions 
-définies dans les modules `loading`, `statistics`, `visualization` et `regression`. Le script charge les données à partir 
-d'un fichier CSV, effectue des analyses statistiques, génère des visualisations, ajuste un modèle de régression linéaire, 
+Ce module exécute une série d'analyses statistiques et de visualisations sur un jeu de données en utilisant les fonctions
+définies dans les modules `loading`, `statistics`, `visualization` et `regression`. Le script charge les données à partir
+d'un fichier CSV, effectue des analyses statistiques, génère des visualisations, ajuste un modèle de régression linéaire,
 et affiche les résultats.
 
+L'analyse est décrite comme un pipeline d'étapes nommées (voir `Linearmodel.pipeline`) : le résultat de chaque étape est
+mémorisé sur disque, et une nouvelle exécution ne recalcule que les étapes en aval de ce qui a changé (fichier CSV,
+paramètres ou code d'une étape).
+
 Utilisation:
-Ce module peut être exécuté directement. Il charge un fichier de données spécifié, effectue des calculs statistiques, 
-génère des graphiques, et ajuste un modèle de régression linéaire. Les résultats sont imprimés dans la console et les 
+Ce module peut être exécuté directement. Il charge un fichier de données spécifié, effectue des calculs statistiques,
+génère des graphiques, et ajuste un modèle de régression linéaire. Les résultats sont imprimés dans la console et les
 graphiques sont sauvegardés en tant que fichiers PNG.
 
 Fonctions:
+- build_pipeline(file_path, target, cache_dir): Construit le pipeline d'analyse.
 - main(): Fonction principale qui exécute toutes les étapes de l'analyse des données, des visualisations et de la régression linéaire.
 """
 
@@ -22,97 +27,118 @@ from Linearmodel.loading import load_data
 from Linearmodel.statistics import calculate_mean, calculate_std, calculate_correlation, calculate_median, calculate_variance, calculate_mode, calculate_weighted_mode, summary, find_highly_correlated_variables
 from Linearmodel.visualization import plot_multiple_boxplots, plot_scatter, plot_heatmap, plot_predictions_vs_observations, plot_multiple_histograms
 from Linearmodel.regression import OrdinaryLeastSquares
+from Linearmodel.pipeline import Pipeline
 
-def main():
-    file_path = 'eCO2mix_RTE_Annuel-Definitif_2020.csv'
-    data = load_data(file_path)
 
-    # Vérifier les premières lignes du DataFrame
-    print(data.head())
+def numeric_columns(data):
+    return data.select_dtypes(include=[np.number]).columns.tolist()
+
+
+def basic_statistics(data):
+    return {
+        # Calculer la moyenne de la colonne 'Solaire'
+        'Moyenne de Solaire': calculate_mean(data, 'Solaire'),
+        # Calculer l'écart type de la colonne 'Gaz'
+        "Ecart type de la colonne 'Gaz'": calculate_std(data, 'Gaz'),
+        # Calculer la corrélation entre les colonnes 'Fioul' et 'Charbon'
+        "Corrélation entre 'Fioul' et 'Charbon'": calculate_correlation(data, 'Fioul', 'Charbon')['Correlation'],
+        # Calculer la médiane de la colonne 'Consommation'
+        'Médiane de la Consommation': calculate_median(data, 'Consommation'),
+        # Calculer la variance de la colonne 'Hydraulique'
+        "Variance de l'Hydraulique": calculate_variance(data, 'Hydraulique'),
+        # Calculer le mode de la colonne 'Prévision J'
+        'Mode de la Prévision J': calculate_mode(data, 'Prévision J'),
+        # Calculer le mode pondéré de la colonne 'Prévion J-1'
+        'Mode pondéré de la Prévion J-1 ': calculate_weighted_mode(data, 'Prévision J-1'),
+    }
 
-    # Vérifier les types de données et les valeurs manquantes
-    print(data.info())
-    print(data.describe())
 
-    # Afficher les histogrammes pour toutes les colonnes numériques
-    numeric_columns = data.select_dtypes(include=[np.number]).columns.tolist()
-    plot_multiple_histograms(data, numeric_columns, 'multiple_histograms.png')
+def fit_model(data, correlated_variables, target):
+    # Sélectionner les colonnes X et la colonne y pour la régression
+    X = data[correlated_variables].values  # Variables explicatives pour l'entraînement
+    y = data[target].values  # Variable cible pour l'entraînement
 
-    # Afficher les boxplots pour toutes les colonnes
-    plot_multiple_boxplots(data, numeric_columns, 'multiple_boxplots.png')
+    # Initialisation du modèle de régression linéaire avec intercept, puis entraînement
+    model = OrdinaryLeastSquares(intercept=True)
+    model.fit(X, y)
+    return model
 
-    # Calculer la moyenne de la colonne 'Solaire'
-    mean_solaire = calculate_mean(data, 'Solaire')
-    print(f"Moyenne de Solaire: {mean_solaire}")
 
-    # Calculer l'écart type de la colonne 'Gaz'
-    std_gaz = calculate_std(data, 'Gaz')
-    print(f"Ecart type de la colonne 'Gaz': {std_gaz}")
+def predict(data, correlated_variables, model):
+    # Prédictions pour les données existantes
+    return model.predict(data[correlated_variables].values)
 
-    # Calculer la corrélation entre les colonnes 'Fioul' et 'Charbon'
-    correlation_fioul_charbon = calculate_correlation(data, 'Fioul', 'Charbon')
-    print(f"Corrélation entre 'Fioul' et 'Charbon': {correlation_fioul_charbon['Correlation']}")
 
-    # Calculer la médiane de la colonne 'Consommation'
-    median_consommation = calculate_median(data, 'Consommation')
-    print(f"Médiane de la Consommation: {median_consommation}")
+def plot_predictions(data, y_pred, target, file_name):
+    plot_predictions_vs_observations(data[target].values, y_pred, file_name)
 
-    # Calculer la variance de la colonne 'Hydraulique'
-    variance_hydraulique = calculate_variance(data, 'Hydraulique')
-    print(f"Variance de l'Hydraulique: {variance_hydraulique}")
 
-    # Calculer le mode de la colonne 'Prévision J'
-    mode_prevision_j = calculate_mode(data, 'Prévision J')
-    print(f"Mode de la Prévision J: {mode_prevision_j}")
+def build_pipeline(file_path='eCO2mix_RTE_Annuel-Definitif_2020.csv', target='Taux de Co2', cache_dir='.pipeline_cache'):
+    pipeline = Pipeline(cache_dir=cache_dir)
+    pipeline.add_stage('data', load_data, params={'file_path': file_path}, files=[file_path])
+    pipeline.add_stage('numeric_columns', numeric_columns, inputs=['data'])
 
-    # Calculer le mode pondéré de la colonne 'Prévion J-1'
-    weighted_mode_prevision_j_1 = calculate_weighted_mode(data, 'Prévision J-1')
-    print(f"Mode pondéré de la Prévion J-1 : {weighted_mode_prevision_j_1}")
+    # Histogrammes et boxplots pour toutes les colonnes numériques
+    pipeline.add_stage('histograms', plot_multiple_histograms, inputs=['data', 'numeric_columns'],
+                       params={'file_name': 'multiple_histograms.png'}, outputs=['multiple_histograms.png'])
+    pipeline.add_stage('boxplots', plot_multiple_boxplots, inputs=['data', 'numeric_columns'],
+                       params={'file_name': 'multiple_boxplots.png'}, outputs=['multiple_boxplots.png'])
 
-    # Réaliser une analyse descriptive du DataFrame
-    results = summary(data)
+    pipeline.add_stage('basic_statistics', basic_statistics, inputs=['data'])
+    pipeline.add_stage('summary', summary, inputs=['data'])
 
-    # Afficher les résultats de l'analyse descriptive
-    for column, stats in results.items():
-        print(f"--- {column} ---")
-        for stat_name, value in stats.items():
-            print(f"{stat_name}: {value}")
-        print()
+    # Nuage de points entre 'Fioul' et 'Gaz', et heatmap des corrélations
+    pipeline.add_stage('scatter', plot_scatter, inputs=['data'], params={'x_column': 'Fioul', 'y_column': 'Gaz'},
+                       outputs=['Fioul_vs_Gaz_nuage_de_point.png'])
+    pipeline.add_stage('heatmap', plot_heatmap, inputs=['data'], outputs=['heatmap.png'])
 
-    # Afficher et sauvegarder le nuage de points entre 'Consommation' et 'Gaz'
-    plot_scatter(data, 'Fioul', 'Gaz')
+    # Variables hautement corrélées avec la cible, régression et prédictions
+    pipeline.add_stage('correlated_variables', find_highly_correlated_variables, inputs=['data'],
+                       params={'target': target})
+    pipeline.add_stage('model', fit_model, inputs=['data', 'correlated_variables'], params={'target': target})
+    pipeline.add_stage('predictions', predict, inputs=['data', 'correlated_variables', 'model'])
+    pipeline.add_stage('predictions_plot', plot_predictions, inputs=['data', 'predictions'],
+                       params={'target': target, 'file_name': 'predictions_vs_observations.png'},
+                       outputs=['predictions_vs_observations.png'])
+    return pipeline
 
-    # Afficher et sauvegarder la heatmap des corrélations
-    plot_heatmap(data)
 
-    # Trouver les variables hautement corrélées avec 'Taux de Co2'
+def main():
     target = 'Taux de Co2'
-    correlated_variables = find_highly_correlated_variables(data, target)
-    print(f"Variables hautement corrélées avec {target} : {correlated_variables}")
+    pipeline = build_pipeline(target=target)
+    results = pipeline.run()
+    print(f"Étapes recalculées : {pipeline.computed}")
 
-    # Sélectionner les colonnes X et la colonne y pour la régression
-    X = data[correlated_variables].values  # Variables explicatives pour l'entraînement
-    y = data[target].values  # Variable cible pour l'entraînement
+    data = results['data']
 
-    # Initialisation du modèle de régression linéaire avec intercept
-    model = OrdinaryLeastSquares(intercept=True)
+    # Vérifier les premières lignes du DataFrame
+    print(data.head())
 
-    # Entraînement du modèle
-    model.fit(X, y)
+    # Vérifier les types de données et les valeurs manquantes
+    print(data.info())
+    print(data.describe())
+
+    for name, value in results['basic_statistics'].items():
+        print(f"{name}: {value}")
+
+    # Afficher les résultats de l'analyse descriptive
+    for column, stats in results['summary'].items():
+        print(f"--- {column} ---")
+        for stat_name, value in stats.items():
+            print(f"{stat_name}: {value}")
+        print()
+
+    correlated_variables = results['correlated_variables']
+    print(f"Variables hautement corrélées avec {target} : {correlated_variables}")
 
     # Affichage des coefficients estimés
+    model = results['model']
     coeffs = model.get_coeffs()
     print("Coefficients estimés:", coeffs)
 
     # Calcul du coefficient de détermination R^2
-    r_squared = model.determination_coefficient(X, y)
+    r_squared = model.determination_coefficient(data[correlated_variables].values, data[target].values)
     print("Coefficient de détermination R^2:", r_squared)
 
-    # Prédictions pour les données existantes
-    y_pred = model.predict(X)
-
-    # Affichage des prédictions et des observations réelles sur un graphique
-    plot_predictions_vs_observations(y, y_pred, 'predictions_vs_observations.png')
-
 if __name__ == "__main__":
     main()